@@ -1,8 +1,196 @@
+import json
+import os
+import queue
+import threading
+import time
+
 import streamlit as st
+import numpy as np
 import pandas as pd
 import plotly.graph_objects as go
+from plotly.colors import qualitative
+
+from tts.backends import BACKENDS
+from tts.mos import CRITERIA, MosAggregator
+from tts.prompts import PROMPT
+from tts.scores import DEFAULT_PATH, leaderboard, load_scores, page, page_count, with_ratings
+
+
+############################################################################################################
+# Caching: bouwstenen worden één keer opgebouwd en pas opnieuw gelezen als het bronbestand wijzigt
+############################################################################################################
+def bestand_versie(pad):
+    """Versie van een bestand als cachesleutel: (mtime, grootte), of None als het ontbreekt."""
+    try:
+        stat = os.stat(pad)
+    except FileNotFoundError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+
+@st.cache_data(show_spinner=False, max_entries=64)
+def lees_bestand(pad, versie):
+    with open(pad, "rb") as f:
+        return f.read()
+
+
+@st.cache_data(show_spinner=False, max_entries=64)
+def gecomprimeerde_audio(pad, versie):
+    """OGG-versie van een WAV-fragment (eenmalig omgezet); zonder soundfile de originele WAV."""
+    try:
+        import soundfile  # noqa: F401
+    except ImportError:
+        return lees_bestand(pad, versie), "audio/wav"
+    from tts.assets import transcode
+
+    return transcode(pad).read_bytes(), "audio/ogg"
+
+
+@st.cache_data(show_spinner=False, max_entries=32)
+def radar_figuur(modellen, scores, categories, kleuren, intervallen=None):
+    """Eén radar met alle gekozen modellen over elkaar, in plaats van een figuur per model."""
+    theta = list(categories) + [categories[0]]
+    fig = go.Figure()
+    for i, (model_name, model_scores, kleur) in enumerate(zip(modellen, scores, kleuren)):
+        fig.add_trace(
+            go.Scatterpolar(
+                r=list(model_scores) + [model_scores[0]],  # Sluit de cirkel
+                theta=theta,
+                fill="toself",
+                opacity=0.6,
+                name=model_name,
+                legendgroup=model_name,
+                line=dict(color=kleur),
+            )
+        )
+        # Bootstrap-betrouwbaarheidsinterval als stippellijnen, als er ruwe beoordelingen zijn
+        if intervallen is not None and intervallen[i] is not None:
+            for grens in intervallen[i]:
+                fig.add_trace(
+                    go.Scatterpolar(
+                        r=list(grens) + [grens[0]],
+                        theta=theta,
+                        mode="lines",
+                        legendgroup=model_name,
+                        showlegend=False,
+                        line=dict(color=kleur, dash="dot", width=1),
+                        hoverinfo="skip",
+                    )
+                )
+
+    # Layout aanpassen: vaste schaal 0 - 5
+    fig.update_layout(
+        title="",
+        polar=dict(radialaxis=dict(visible=True, range=[0, 5])),
+        showlegend=True,
+    )
+    return fig
+
+
+@st.cache_resource(show_spinner=False)
+def benchmark_figuren(pad, versie, kleuren):
+    """Tabel en grafieken van de snelheidsmetingen in results/benchmark.json."""
+    benchmark = json.loads(lees_bestand(pad, versie))
+    # Modellen waarvan de meting mislukte staan met alleen een foutmelding in het rapport
+    mislukt = {r["model"]: r["error"] for r in benchmark["models"] if "error" in r}
+    prestaties = pd.DataFrame(
+        [r for r in benchmark["models"] if "error" not in r],
+        columns=["model", "model_id", "cold_load_s", "p50_ms", "p90_ms", "p99_ms", "rtf", "peak_rss_mb", "threads_ms"],
+    )
+    model_kleuren = dict(kleuren)
+
+    tabel = prestaties[["model", "cold_load_s", "p50_ms", "p90_ms", "p99_ms", "rtf", "peak_rss_mb"]].rename(
+        columns={
+            "model": "Model",
+            "cold_load_s": "Laadtijd (s)",
+            "p50_ms": "p50 (ms)",
+            "p90_ms": "p90 (ms)",
+            "p99_ms": "p99 (ms)",
+            "rtf": "Real-time factor",
+            "peak_rss_mb": "Piekgeheugen (MB)",
+        }
+    )
+
+    rtf_fig = go.Figure(
+        go.Bar(
+            x=prestaties["model"],
+            y=prestaties["rtf"],
+            marker_color=[model_kleuren.get(m, "gray") for m in prestaties["model"]],
+        )
+    )
+    rtf_fig.update_layout(title="Real-time factor (lager is beter)", yaxis_title="RTF")
+
+    # Schaling met het aantal CPU-threads (alleen offline modellen)
+    threads_fig = go.Figure()
+    for _, rij in prestaties.iterrows():
+        if rij["threads_ms"]:
+            threads = sorted(rij["threads_ms"], key=int)
+            threads_fig.add_trace(
+                go.Scatter(
+                    x=[int(n) for n in threads],
+                    y=[rij["threads_ms"][n] for n in threads],
+                    mode="lines+markers",
+                    name=rij["model"],
+                    line=dict(color=model_kleuren.get(rij["model"], "gray")),
+                )
+            )
+    threads_fig.update_layout(
+        title="Latency van de testzin per aantal CPU-threads", xaxis_title="Threads", yaxis_title="ms"
+    )
+    return benchmark, tabel, rtf_fig, threads_fig, mislukt
+
+
+# Leesbare namen voor de fasen uit tts.profiling, in dezelfde volgorde
+FASEN = {
+    "tokenize": "Tokenisatie",
+    "encoder": "Tekst-encoder",
+    "duration": "Duurvoorspelling",
+    "decoder": "Decoder / generate",
+    "vocoder": "Vocoder",
+    "request": "API-verzoek",
+    "to_numpy": "Naar numpy",
+    "write": "Wegschrijven",
+    "overig": "Overig",
+}
+
+
+@st.cache_resource(show_spinner=False)
+def fasen_figuur(pad, versie):
+    """Gestapelde staafgrafiek van de tijd per fase uit results/stages.json."""
+    metingen = json.loads(lees_bestand(pad, versie))
+    modellen = [m["model"] for m in metingen["models"]]
+    fig = go.Figure()
+    for fase, label in FASEN.items():
+        tijden = [m["stages"].get(fase, {}).get("wall_ms", 0.0) for m in metingen["models"]]
+        if any(tijden):
+            fig.add_trace(go.Bar(x=modellen, y=tijden, name=label))
+    fig.update_layout(barmode="stack", title="Tijd per fase per uiting", yaxis_title="ms")
+    return metingen, fig
+
+
+@st.cache_resource(show_spinner=False)
+def workers_figuur(pad, versie):
+    """Doorvoercurves uit results/workers.json: uitingen per seconde tegen het aantal workers."""
+    metingen = json.loads(lees_bestand(pad, versie))
+    resultaten = pd.DataFrame(metingen["results"]).sort_values("workers")
+    fig = go.Figure()
+    for threads, rijen in resultaten.groupby("threads"):
+        fig.add_trace(
+            go.Scatter(
+                x=rijen["workers"],
+                y=rijen["utterances_per_sec"],
+                mode="lines+markers",
+                name=f"{threads} thread{'s' if threads > 1 else ''} per worker",
+            )
+        )
+    fig.update_layout(
+        title=f"Doorvoer van {metingen['model']} met meerdere processen",
+        xaxis_title="Workers",
+        yaxis_title="Uitingen per seconde",
+        xaxis=dict(tickmode="array", tickvals=sorted(resultaten["workers"].unique())),
+    )
+    return metingen, fig
 
-st.cache_data.clear()
 
 # Display the banner image
 st.image("media/banner.png", use_container_width=True)
@@ -79,23 +267,41 @@ De evaluatie laat de sterke en zwakke punten van elk model zien. Deze inzichten
 ############################################################################################################
 st.header("Modellen en Prestaties")
 
-# Definieer de evaluatiescores
-data = {
-    "Model": [
-        "parler-tts-mini-multilingual-v1.1",
-        "speecht5_finetuned_facebook_voxpopuli_dutch",
-        "training_tts_nl_v2",
-        "mms-tts-nld",
-        "OpenAI-TTS-1-hd",
-    ],
-    "Natuurlijkheid": [5, 1, 2, 4, 4],
-    "Verstaanbaarheid": [4, 3, 3, 4, 5],
-    "Audio-kwaliteit": [3, 2, 4, 4, 5],
-    "Stememotie": [4, 1, 2, 3, 5],
-    "Algemene tevredenheid": [4, 2, 3, 4, 5],
-}
+@st.cache_data(show_spinner=False)
+def mos_resultaten(pad, versie):
+    """Gemiddelden, rangschikking en 95%-intervallen uit de ruwe beoordelingen per deelnemer."""
+    aggregator = MosAggregator.from_file(pad)
+    ondergrens, bovengrens = aggregator.confidence_intervals()
+    return aggregator.means().reset_index(), aggregator.ranking(), ondergrens, bovengrens
+
 
-df = pd.DataFrame(data)
+@st.cache_resource(show_spinner=False)
+def score_opslag(pad, versie, ratings_pad=None, ratings_versie=None):
+    """Scores en metadata uit het Parquet-bestand, één keer ingelezen en geïndexeerd op model-id.
+
+    Het resultaat wordt gedeeld tussen alle sessies en mag dus niet aangepast worden.
+    """
+    scores = load_scores(pad)
+    if ratings_versie is not None:
+        scores = with_ratings(scores, mos_resultaten(ratings_pad, ratings_versie)[0])
+    # Modellen zonder eigen kleur krijgen er een uit een vast palet
+    palet = qualitative.Plotly
+    kleuren = [
+        kleur if isinstance(kleur, str) else palet[i % len(palet)]
+        for i, kleur in enumerate(scores.get("color", pd.Series(index=scores.index, dtype=object)))
+    ]
+    return scores.assign(color=kleuren)
+
+
+# Scores en metadata per model (zie tts/scores.py). Ruwe beoordelingen per deelnemer (formaat: zie
+# tts/mos.py) vervangen de geaggregeerde scores, als ze er zijn.
+ratings_pad = "media/ratings.csv"
+ratings_versie = bestand_versie(ratings_pad)
+rangschikking = ondergrens = bovengrens = None
+if ratings_versie is not None:
+    _, rangschikking, ondergrens, bovengrens = mos_resultaten(ratings_pad, ratings_versie)
+scores_pad = str(DEFAULT_PATH)
+scores_per_model = score_opslag(scores_pad, bestand_versie(scores_pad), ratings_pad, ratings_versie)
 
 # Modelbeschrijvingen
 model_info = [
@@ -165,53 +371,136 @@ Het model [`training_tts_nl_v2`](https://huggingface.co/procit008/training_tts_n
 ]
 
 # Lijst met evaluatiecategorieën
-categories = df.columns[1:].tolist()
-colors = ["red", "green", "blue", "orange", "purple"]
+categories = tuple(c for c in CRITERIA if c in scores_per_model.columns)
+kleuren = scores_per_model["color"]
 
 # Loop door de modellen en toon alles in één sectie per model
 for i, (model_name, description) in enumerate(model_info):
     st.subheader(model_name)
     st.markdown(description)
-    # Radar plot voor het model
-    model_scores = df[df["Model"] == model_name].iloc[:, 1:].values.flatten().tolist()
-    model_scores.append(model_scores[0])  # Sluit de cirkel
-
-    fig = go.Figure()
-    fig.add_trace(
-        go.Scatterpolar(
-            r=model_scores,
-            theta=categories + [categories[0]],
-            fill="toself",
-            name=model_name,
-            line=dict(color=colors[i]),
-        )
-    )
-
-    # Layout aanpassen: vaste schaal 0 - 5
-    fig.update_layout(
-        title="",
-        polar=dict(radialaxis=dict(visible=True, range=[0, 5])),
-        showlegend=False,
-    )
-
-    # Weergeven in Streamlit
-    st.plotly_chart(fig, use_container_width=True)
-    st.audio(f"media/{i + 1}.wav", format="audio/wav", autoplay=False)
+    # Het fragment wordt pas opgehaald en meegestuurd als de bezoeker erom vraagt
+    if st.toggle("Beluister het fragment", key=f"audio_{i}"):
+        audio_pad = f"media/{i + 1}.wav"
+        audio_bytes, audio_format = gecomprimeerde_audio(audio_pad, bestand_versie(audio_pad))
+        st.audio(audio_bytes, format=audio_format, autoplay=False)
     with st.container():
         # Expander voor het tonen van een voorbeeldcodebestand (optioneel)
-        try:
-            with open(f"media/{i + 1}.py", "r") as f:
-                code_content = f.read()
+        code_pad = f"media/{i + 1}.py"
+        code_versie = bestand_versie(code_pad)
+        # Als er geen codebestand is, laat het dan gewoon weg
+        if code_versie is not None:
+            code_content = lees_bestand(code_pad, code_versie).decode("utf-8")
 
             with st.expander(f"Laat voorbeeldcode zien voor {model_name}"):
                 st.code(code_content, language="python")
 
-        except FileNotFoundError:
-            pass  # Als er geen codebestand is, laat het dan gewoon weg
-
-# Toon de evaluatiescores in een tabel onderaan
+# Ranglijst van alle modellen: sorteren, filteren en pagineren gebeurt op de kolommen; alleen de
+# zichtbare pagina wordt naar de browser gestuurd en alleen gekozen modellen komen in de radar
 st.subheader("Overzicht van Model Scores")
-st.dataframe(df)
+PAGINA_GROOTTE = 25
+filter_kolommen = st.columns([2, 1, 1])
+zoekterm = filter_kolommen[0].text_input("Zoek een model")
+sorteer_op = filter_kolommen[1].selectbox("Sorteer op", ["Gemiddelde", *categories, "Model"])
+alleen_offline = filter_kolommen[2].toggle("Alleen offline modellen")
+ranglijst = leaderboard(scores_per_model, sorteer_op, zoekterm, offline=True if alleen_offline else None)
+
+aantal_paginas = page_count(ranglijst, PAGINA_GROOTTE)
+pagina = 1
+if aantal_paginas > 1:
+    pagina = st.number_input(f"Pagina (van {aantal_paginas})", min_value=1, max_value=aantal_paginas, value=1)
+zichtbaar = page(ranglijst, pagina, PAGINA_GROOTTE)
+st.caption(f"{len(ranglijst)} van {len(scores_per_model)} modellen")
+st.dataframe(
+    zichtbaar[["Gemiddelde", *categories, "architecture", "offline", "url"]],
+    column_config={
+        "Gemiddelde": st.column_config.ProgressColumn("Gemiddelde", min_value=0, max_value=5, format="%.1f"),
+        **{c: st.column_config.NumberColumn(c, format="%.1f") for c in categories},
+        "architecture": "Architectuur",
+        "offline": st.column_config.CheckboxColumn("Offline"),
+        "url": st.column_config.LinkColumn("Link", display_text="model"),
+    },
+)
+
+# Eén radar voor de gekozen modellen van deze pagina
+gekozen = st.multiselect(
+    "Vergelijk in de radar", options=list(zichtbaar.index), default=list(zichtbaar.index[:5])
+)
+if gekozen:
+    intervallen = None
+    if ondergrens is not None:
+        intervallen = tuple(
+            (tuple(ondergrens.loc[m, list(categories)]), tuple(bovengrens.loc[m, list(categories)]))
+            if m in ondergrens.index else None
+            for m in gekozen
+        )
+    radar = radar_figuur(
+        tuple(gekozen),
+        tuple(tuple(scores_per_model.loc[m, list(categories)]) for m in gekozen),
+        categories,
+        tuple(kleuren.loc[gekozen]),
+        intervallen,
+    )
+    st.plotly_chart(radar, use_container_width=True)
+
+# Snelheid en resourcegebruik, gemeten met benchmarks/speed.py
+st.subheader("Snelheid en resourcegebruik")
+benchmark_pad = "results/benchmark.json"
+benchmark_versie = bestand_versie(benchmark_pad)
+if benchmark_versie is not None:
+    benchmark, prestatie_tabel, rtf_fig, threads_fig, mislukt = benchmark_figuren(
+        benchmark_pad, benchmark_versie, tuple(kleuren.items())
+    )
+
+    st.markdown("""
+    De MOS-scores hierboven zeggen niets over **snelheid**. Onderstaande metingen zijn gedaan op een vaste set
+    Nederlandse zinnen: de koude laadtijd, de warme latency (p50/p90/p99), de **real-time factor** (rekentijd
+    gedeeld door de duur van de audio; onder 1 is sneller dan real-time) en het piekgeheugen. OpenAI is gemeten
+    tegen een lokale stub, dus zonder echte netwerk- en serverlatency.
+    """)
+    st.dataframe(prestatie_tabel, hide_index=True)
+    st.plotly_chart(rtf_fig, use_container_width=True)
+    st.plotly_chart(threads_fig, use_container_width=True)
+    for model_name, fout in mislukt.items():
+        st.caption(f"{model_name} kon niet gemeten worden: {fout}")
+
+    machine = benchmark["machine"]
+    st.caption(f"Gemeten op {benchmark['created']}: {machine['platform']}, {machine['cpu_count']} CPU's.")
+else:
+    st.info("Nog geen snelheidsmetingen beschikbaar. Voer `python -m benchmarks.speed` uit om ze te genereren.")
+
+# Tijdsverdeling per fase, gemeten met benchmarks/stages.py
+st.subheader("Waar gaat de tijd naartoe?")
+fasen_pad = "results/stages.json"
+fasen_versie = bestand_versie(fasen_pad)
+if fasen_versie is not None:
+    fasen, fasen_fig = fasen_figuur(fasen_pad, fasen_versie)
+    st.markdown("""
+    Elke synthese is opgesplitst in fasen: tokenisatie, de tekst-encoder, de decoder (bij Parler de
+    autoregressieve `generate`-lus), de vocoder die er een golfvorm van maakt, de omzetting naar numpy en
+    het wegschrijven van het WAV-bestand. Zo is te zien welk deel van een traag model de tijd kost.
+    """)
+    st.plotly_chart(fasen_fig, use_container_width=True)
+    st.caption(f"Gemeten op {fasen['created']}, gemiddeld per uiting over {fasen['prompts']} zinnen.")
+else:
+    st.info("Nog geen fasemetingen beschikbaar. Voer `python -m benchmarks.stages` uit om ze te genereren.")
+
+# Doorvoer met meerdere processen, gemeten met benchmarks/workers.py
+st.subheader("Meer uitingen per seconde met meerdere processen")
+workers_pad = "results/workers.json"
+workers_versie = bestand_versie(workers_pad)
+if workers_versie is not None:
+    workers_metingen, workers_fig = workers_figuur(workers_pad, workers_versie)
+    st.markdown("""
+    Eén synthese schaalt slecht met extra threads. Op een CPU-machine levert het verdelen van de zinnen over
+    meerdere processen, elk met een klein threadbudget, meer uitingen per seconde op (zie `tts/workers.py`).
+    """)
+    st.plotly_chart(workers_fig, use_container_width=True)
+    st.caption(
+        f"Gemeten op {workers_metingen.get('created', 'onbekende datum')} met {workers_metingen['utterances']} "
+        f"uitingen op {workers_metingen['cpu_count']} CPU's."
+    )
+else:
+    st.info("Nog geen doorvoermetingen beschikbaar. Voer `python -m benchmarks.workers` uit om ze te genereren.")
 
 
 
@@ -220,28 +509,103 @@ st.dataframe(df)
 ############################################################################################################
 st.header("Conclusie en Aanbevelingen")
 
-st.markdown("""
+# Rangschikking op gemiddelde score, berekend uit de scores hierboven; bij veel modellen de top 10
+gemiddelden = scores_per_model["Gemiddelde"].sort_values(ascending=False, kind="stable")
+regels = []
+for plaats, (model_name, score) in enumerate(gemiddelden.head(10).items(), start=1):
+    regel = f"{plaats}. **{model_name}** (**{round(score, 1):g}**)"
+    if rangschikking is not None and model_name in rangschikking.index:
+        rij = rangschikking.loc[model_name]
+        regel += f" — 95%-interval {rij['Ondergrens']:.1f}–{rij['Bovengrens']:.1f}"
+    regels.append(regel)
+st.markdown("**Algemene Rangschikking op Gemiddelde Score:**\n" + "\n".join(regels))
+if rangschikking is not None:
+    # Hoe stabiel is de volgorde als je andere deelnemers had getrokken?
+    st.dataframe(rangschikking.style.format("{:.2f}"))
+
+
+# Beste, beste offline en slechtste model volgens de gemiddelden hierboven. De uitgeschreven tekst hoort
+# bij de oorspronkelijke enquête en verschijnt alleen als die modellen nog op dezelfde plek staan;
+# anders volgt een neutrale, gegenereerde zin.
+beoordeeld = gemiddelden.dropna()
+if "offline" in scores_per_model.columns:
+    offline_modellen = beoordeeld[scores_per_model.loc[beoordeeld.index, "offline"].eq(True).to_numpy()]
+else:
+    offline_modellen = beoordeeld.iloc[:0]
+
+
+def modelnaam(model_name):
+    """Modelnaam als link naar de modelpagina, als die bekend is."""
+    url = scores_per_model["url"].get(model_name) if "url" in scores_per_model.columns else None
+    return f"[`{model_name}`]({url})" if isinstance(url, str) else f"`{model_name}`"
+
+
+def afgerond(model_name):
+    """Afgeronde gemiddelde score van ``model_name``."""
+    return f"{round(beoordeeld[model_name], 1):g}"
+
+
+# Rol -> (model waarvoor de tekst geschreven is, tekst); {score} wordt ingevuld
+VERHAAL = {
+    "beste": ("OpenAI-TTS-1-hd", """
+- [`OpenAI TTS-1-hd`](https://platform.openai.com/docs/guides/text-to-speech) behaalt de hoogste gemiddelde score van {score}, met topwaarderingen op verstaanbaarheid, audiokwaliteit, stememotie en algemene tevredenheid. Dit resultaat is niet verrassend, aangezien OpenAI een van de marktleiders is. Toch is er ruimte voor verbetering: het model heeft een duidelijk Amerikaans accent, terwijl specifiek op het Nederlands getrainde modellen dit niet hebben. Daarnaast is het uitsluitend als betaald cloudmodel beschikbaar en kan het niet offline worden gebruikt.
+"""),
+    "offline": ("parler-tts-mini-multilingual-v1.1", """
+- [`Parler-TTS Mini Multilingual v1.1`](https://huggingface.co/parler-tts/parler-tts-mini-multilingual-v1.1) heeft een hoge gemiddelde score van **{score}**. Een groot voordeel van dit model is dat het meertalig is en dat er veel controle is over de spraakkenmerken door middel van een extra prompt. Ook heeft het model geen last van een Amerikaans accent in tegenstelling tot het OpenAI-model.
+Alleen de geluidskwaliteit scoort iets lager omdat het lijkt alsof de spreker ver van de microfoon staat. Mogelijk is hier met prompt engineering nog iets te verbeteren!
+"""),
+    "slechtste": ("speecht5_finetuned_facebook_voxpopuli_dutch", """
+- [`speecht5_finetuned_facebook_voxpopuli_dutch`](https://huggingface.co/Kodamn47/speecht5_finetuned_facebook_voxpopuli_dutch) scoort het laagst met een gemiddelde van **{score}**. Dit model presteert ondermaats in alle categorieën. Het lijkt erop dat het model nog verder gefinetuned moet worden om betere resultaten te behalen. Op Hugging Face staan meerdere varianten van dit model die nog wekelijks geupdate worden dus wellicht presteert een andere variant van dit model beter!
+"""),
+}
+NEUTRAAL = {
+    "beste": "- {model} behaalt de hoogste gemiddelde score van **{score}**.",
+    "offline": "- {model} is het best scorende offline model, met een gemiddelde van **{score}**.",
+    "slechtste": "- {model} scoort het laagst met een gemiddelde van **{score}**.",
+}
+
+
+def alinea(rol, model_name):
+    """Uitgeschreven tekst als ``model_name`` het model van ``VERHAAL`` is, anders een neutrale zin."""
+    if model_name is None:
+        return "- Geen model met een score in deze categorie."
+    verhaal_model, verhaal = VERHAAL[rol]
+    if model_name == verhaal_model:
+        return verhaal.strip().format(score=afgerond(model_name))
+    return NEUTRAAL[rol].format(model=modelnaam(model_name), score=afgerond(model_name))
+
 
-**Algemene Rangschikking op Gemiddelde Score:**
-1. **OpenAI-TTS-1-hd** (**4.8**)
-2. **parler-tts-mini-multilingual-v1.1** (**4**)
-3. **mms-tts-nld** (**3.8**)
-4. **training_tts_nl_v2** (**2.8**)
-5. **speecht5_finetuned_facebook_voxpopuli_dutch** (**1.8**)
+beste = beoordeeld.index[0] if len(beoordeeld) else None
+beste_offline = offline_modellen.index[0] if len(offline_modellen) else None
+slechtste = beoordeeld.index[-1] if len(beoordeeld) > 1 else None
 
+if (beste, beste_offline) == (VERHAAL["beste"][0], VERHAAL["offline"][0]):
+    advies = (
+        "Wie op zoek is naar de beste spraakkwaliteit en geen bezwaar heeft tegen een cloudoplossing, kiest voor "
+        "OpenAI-TTS-1-hd. Wil je echter een lokaal draaiend model met veel controle over de spraak, dan is "
+        "parler-tts-mini-multilingual-v1.1 een uitstekende keuze."
+    )
+elif beste is not None:
+    advies = f"Op basis van de gemiddelde scores is {modelnaam(beste)} de beste keuze"
+    if beste_offline is not None and beste_offline != beste:
+        advies += f"; wie een lokaal draaiend model zoekt, kiest {modelnaam(beste_offline)}"
+    advies += "."
+else:
+    advies = ""
+
+st.markdown(f"""
 **Beste Model:**
-- [`OpenAI TTS-1-hd`](https://platform.openai.com/docs/guides/text-to-speech) behaalt de hoogste gemiddelde score van 4.8, met topwaarderingen op verstaanbaarheid, audiokwaliteit, stememotie en algemene tevredenheid. Dit resultaat is niet verrassend, aangezien OpenAI een van de marktleiders is. Toch is er ruimte voor verbetering: het model heeft een duidelijk Amerikaans accent, terwijl specifiek op het Nederlands getrainde modellen dit niet hebben. Daarnaast is het uitsluitend als betaald cloudmodel beschikbaar en kan het niet offline worden gebruikt.
+{alinea("beste", beste)}
 
 **Beste Offline Model:**
-- [`Parler-TTS Mini Multilingual v1.1`](https://huggingface.co/parler-tts/parler-tts-mini-multilingual-v1.1) heeft een hoge gemiddelde score van **4**. Een groot voordeel van dit model is dat het meertalig is en dat er veel controle is over de spraakkenmerken door middel van een extra prompt. Ook heeft het model geen last van een Amerikaans accent in tegenstelling tot het OpenAI-model.
-Alleen de geluidskwaliteit scoort iets lager omdat het lijkt alsof de spreker ver van de microfoon staat. Mogelijk is hier met prompt engineering nog iets te verbeteren!
+{alinea("offline", beste_offline)}
 
 
 **Slechtste Presterende Model:**
-- [`speecht5_finetuned_facebook_voxpopuli_dutch`](https://huggingface.co/Kodamn47/speecht5_finetuned_facebook_voxpopuli_dutch) scoort het laagst met een gemiddelde van **1.8**. Dit model presteert ondermaats in alle categorieën. Het lijkt erop dat het model nog verder gefinetuned moet worden om betere resultaten te behalen. Op Hugging Face staan meerdere varianten van dit model die nog wekelijks geupdate worden dus wellicht presteert een andere variant van dit model beter!
+{alinea("slechtste", slechtste)}
 
 
-Wie op zoek is naar de beste spraakkwaliteit en geen bezwaar heeft tegen een cloudoplossing, kiest voor OpenAI-TTS-1-hd. Wil je echter een lokaal draaiend model met veel controle over de spraak, dan is parler-tts-mini-multilingual-v1.1 een uitstekende keuze.
+{advies}
 
 De ontwikkeling van open-source en offline TTS-modellen gaat snel, het is interessant om te volgen hoe deze technologie zich verder zal verbeteren. Vooral voor het Nederlands is er nog veel ruimte voor groei en optimalisatie.
 Voor nu bieden de beschikbare modellen al een goede basis voor verschillende toepassingen, van spraakassistenten tot toegankelijkheidstools.
@@ -252,6 +616,89 @@ st.markdown(
     **Door:** [Noah Christian Le Roy](https://nl.linkedin.com/in/noah-le-roy)
     """)
 ############################################################################################################
+# Live demo: gestreamde synthese
+############################################################################################################
+st.header("Live demo: gestreamde spraak")
+
+st.markdown("""
+Voor een spraakassistent telt vooral hoe snel het **eerste geluid** klinkt. De tekst wordt daarom opgeknipt
+op zins- en bijzingrenzen. Het eerste fragment wordt afgespeeld zodra het klaar is; de volgende fragmenten
+worden intussen gegenereerd en sluiten aan zodra het vorige is uitgespeeld.
+""")
+
+
+@st.cache_resource
+def laad_engine():
+    from tts import get_engine
+
+    return get_engine()
+
+
+def genereer_fragmenten(engine, tekst, model, wachtrij):
+    """Achtergrondthread: (tekst, fragment, tijdstip) op de wachtrij zodra het klaar is; tot slot None."""
+    try:
+        for zin, fragment in engine.stream(tekst, model=model):
+            wachtrij.put((zin, fragment, time.perf_counter()))
+    except Exception as exc:
+        wachtrij.put(exc)
+    finally:
+        wachtrij.put(None)
+
+
+demo_tekst = st.text_area("Tekst", value=PROMPT)
+demo_model = st.selectbox("Model", list(BACKENDS))
+
+if st.button("Spreek uit"):
+    try:
+        import torch  # noqa: F401  (alleen beschikbaar als requirements-tts.txt geïnstalleerd is)
+    except ImportError:
+        st.info("De live demo vereist de pakketten uit `requirements-tts.txt` (torch, transformers, ...).")
+    else:
+        engine = laad_engine()
+        geladen = False
+        with st.spinner(f"{demo_model} laden..."):
+            try:
+                engine.pool.get(demo_model)
+                geladen = True
+            except Exception as exc:
+                # Bijvoorbeeld OpenAI zonder API-sleutel of Parler-TTS zonder het pakket parler_tts
+                st.error(f"{demo_model} kon niet geladen worden: {type(exc).__name__}: {exc}")
+
+        if geladen:
+            metric_kolommen = st.columns(2)
+            huidige_zin = st.empty()
+            speler = st.empty()
+            wachtrij = queue.Queue()
+            fragmenten = []
+            start = time.perf_counter()
+            threading.Thread(
+                target=genereer_fragmenten, args=(engine, demo_tekst, demo_model, wachtrij), daemon=True
+            ).start()
+            einde_vorige = klaar = start
+            while (item := wachtrij.get()) is not None:
+                if isinstance(item, Exception):
+                    st.error(f"Genereren mislukt: {type(item).__name__}: {item}")
+                    continue
+                zin, fragment, klaar = item
+                if not fragmenten:
+                    metric_kolommen[0].metric("Tijd tot eerste audio", f"{klaar - start:.2f} s")
+                # Een nieuw fragment vervangt de speler; wacht tot het vorige is uitgespeeld
+                time.sleep(max(0.0, einde_vorige - time.perf_counter()))
+                huidige_zin.caption(f"Fragment {len(fragmenten) + 1}: {zin}")
+                speler.audio(fragment.audio, sample_rate=fragment.sampling_rate, autoplay=True)
+                einde_vorige = time.perf_counter() + fragment.duration
+                fragmenten.append(fragment)
+            # Tot het laatste fragment klaar was; het wachten op het afspelen telt niet mee
+            metric_kolommen[1].metric("Totale generatietijd", f"{klaar - start:.2f} s")
+
+            if fragmenten:
+                st.caption("Volledige uitvoer")
+                st.audio(
+                    np.concatenate([f.audio for f in fragmenten]),
+                    sample_rate=fragmenten[0].sampling_rate,
+                )
+
+############################################################################################################
 # Interactieve sectie
 ############################################################################################################
 st.header("Links")
@@ -0,0 +1 @@
+# Meetscripts voor snelheid en resourcegebruik; uitvoeren vanuit de hoofdmap met ``python -m benchmarks.<naam>``.
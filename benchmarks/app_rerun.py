@@ -0,0 +1,115 @@
+# Belastingstest voor app.py: meet hoe lang één Streamlit-rerun van de pagina duurt en hoeveel
+# media (audio en afbeeldingen) er bij het openen van de pagina naar de browser gaat.
+#
+#     python -m benchmarks.app_rerun                      # huidige app.py
+#     python -m benchmarks.app_rerun --baseline HEAD~1    # vergelijk met een eerdere versie uit git
+#
+# Elke interactie van een bezoeker laat Streamlit het hele script opnieuw uitvoeren. De eerste run
+# is koud (lege caches); de daaropvolgende reruns laten zien wat elke klik op de server kost.
+# AppTest wacht in stappen van tientallen milliseconden op het script, daarom meet een klein
+# omhulsel de looptijd van het script zelf in de scriptthread.
+#
+# De time-to-interactive is een schatting voor een nieuwe bezoeker op een warme server: de
+# mediane scripttijd plus de overdracht van de media bij de opgegeven bandbreedte.
+
+import argparse
+import statistics
+import subprocess
+from pathlib import Path
+
+from streamlit.testing.v1 import AppTest
+
+# Looptijden in seconden en mediabytes per run, aangevuld door het omhulsel rond het gemeten script
+TIMINGS = []
+PAYLOADS = []
+
+_WRAPPER = """\
+import runpy
+import time
+
+import benchmarks.app_rerun
+
+_start = time.perf_counter()
+try:
+    runpy.run_path({script!r}, run_name="__main__")
+finally:
+    benchmarks.app_rerun.TIMINGS.append(time.perf_counter() - _start)
+    benchmarks.app_rerun.PAYLOADS.append(benchmarks.app_rerun.media_bytes())
+"""
+
+
+def media_bytes() -> int:
+    """Totale grootte van de media die tijdens deze run geregistreerd zijn.
+
+    AppTest maakt per run een nieuwe runtime met een lege geheugenopslag voor media, dus alles
+    wat daarin staat is door deze run naar de browser gestuurd.
+    """
+    from streamlit.runtime import Runtime
+
+    storage = Runtime.instance().media_file_mgr._storage
+    return sum(len(file.content) for file in storage._files_by_id.values())
+
+
+def measure(script: Path, reruns: int, bandwidth_mbit: float) -> dict:
+    # Via de package-import, zodat ook ``python -m benchmarks.app_rerun`` dezelfde lijsten ziet als het omhulsel
+    from benchmarks.app_rerun import PAYLOADS, TIMINGS
+
+    wrapper = script.with_name(f".app_rerun_{script.stem}.py")
+    wrapper.write_text(_WRAPPER.format(script=str(script.resolve())))
+    try:
+        TIMINGS.clear()
+        PAYLOADS.clear()
+        app = AppTest.from_file(str(wrapper.resolve()), default_timeout=120)
+        app.run()
+        if app.exception:
+            raise RuntimeError(f"{script} gaf een fout: {app.exception[0].message}")
+        for _ in range(reruns):
+            app.run()
+    finally:
+        wrapper.unlink()
+
+    cold, timings = TIMINGS[0], sorted(TIMINGS[1:])
+    median = statistics.median(timings)
+    payload = PAYLOADS[0]
+    return {
+        "cold_ms": cold * 1000,
+        "median_ms": median * 1000,
+        "p90_ms": timings[int(0.9 * (len(timings) - 1))] * 1000,
+        "payload_kib": payload / 1024,
+        "tti_ms": (median + payload * 8 / (bandwidth_mbit * 1e6)) * 1000,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--app", type=Path, default=Path("app.py"))
+    parser.add_argument("--baseline", help="git-revisie van app.py om mee te vergelijken, bijv. HEAD~1")
+    parser.add_argument("--reruns", type=int, default=20)
+    parser.add_argument("--bandwidth", type=float, default=10.0, help="bandbreedte in Mbit/s voor de TTI-schatting")
+    args = parser.parse_args(argv)
+
+    versions = {"huidig": args.app}
+    baseline = None
+    if args.baseline:
+        # Naast app.py zetten, zodat relatieve paden zoals media/banner.png blijven kloppen
+        baseline = args.app.with_name(".app_baseline.py")
+        baseline.write_text(subprocess.run(
+            ["git", "show", f"{args.baseline}:{args.app.as_posix()}"], check=True, capture_output=True, text=True
+        ).stdout)
+        versions = {args.baseline: baseline, **versions}
+
+    try:
+        print(f"{'versie':<12} {'koud ms':>9} {'mediaan ms':>11} {'p90 ms':>9} {'media KiB':>10} {'TTI ms':>8}")
+        for name, script in versions.items():
+            result = measure(script, args.reruns, args.bandwidth)
+            print(
+                f"{name:<12} {result['cold_ms']:>9.1f} {result['median_ms']:>11.1f} {result['p90_ms']:>9.1f} "
+                f"{result['payload_kib']:>10.0f} {result['tti_ms']:>8.0f}"
+            )
+    finally:
+        if baseline is not None:
+            baseline.unlink()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+# Vergelijk losse synthese met gebatchte synthese in lengte-buckets.
+#
+#     python -m benchmarks.batch --model mms-tts-nld --batch-size 4 8 16
+#
+# Rapporteert per modus het aantal uitingen per seconde en de real-time factor
+# (rekentijd / duur van de gegenereerde audio; lager is beter).
+
+import argparse
+import json
+import time
+
+from tts import Engine
+from tts.prompts import PROMPTS
+
+
+def measure(fn, texts):
+    start = time.perf_counter()
+    speeches = fn(texts)
+    elapsed = time.perf_counter() - start
+    audio_seconds = sum(speech.duration for speech in speeches)
+    return {
+        "utterances_per_sec": len(texts) / elapsed,
+        "rtf": elapsed / audio_seconds,
+        "seconds": elapsed,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--model", default="mms-tts-nld")
+    parser.add_argument("--batch-size", type=int, nargs="+", default=[4, 8, 16])
+    parser.add_argument("--repeat", type=int, default=4, help="hoe vaak de vaste zinnenset herhaald wordt")
+    parser.add_argument("--output", help="schrijf de resultaten ook naar dit JSON-bestand")
+    args = parser.parse_args(argv)
+
+    engine = Engine()
+    texts = PROMPTS * args.repeat
+    # Opwarmen, zodat het laden van het model niet in de meting terechtkomt
+    engine.synthesize(PROMPTS[0], model=args.model)
+
+    results = {"single": measure(lambda ts: [engine.synthesize(t, model=args.model) for t in ts], texts)}
+    for batch_size in args.batch_size:
+        results[f"batch={batch_size}"] = measure(
+            lambda ts: engine.synthesize_batch(ts, model=args.model, batch_size=batch_size), texts
+        )
+
+    print(f"{args.model}: {len(texts)} uitingen")
+    print(f"{'modus':<12} {'utt/s':>8} {'RTF':>8}")
+    for mode, result in results.items():
+        print(f"{mode:<12} {result['utterances_per_sec']:>8.2f} {result['rtf']:>8.3f}")
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump({"model": args.model, "utterances": len(texts), "results": results}, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+# Rendertijd van de resultatenpagina bij veel modellen: 5 echte tegenover 1.000 synthetische.
+#
+#     python -m benchmarks.leaderboard                  # 1.000 synthetische modellen
+#     python -m benchmarks.leaderboard --models 100 1000 5000
+#
+# Per scoretabel draait app.py in een eigen subproces (TTS_SCORES wijst naar de tabel) en meet
+# benchmarks.app_rerun de koude run en de mediane rerun. Daarnaast wordt vergeleken wat de oude
+# opzet (één radarfiguur per model) tegenover de ene overlay-radar zou kosten aan opbouwtijd en aan
+# figuur-JSON die naar de browser gaat.
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import plotly.graph_objects as go
+
+from tts.mos import CRITERIA
+from tts.scores import DEFAULT_PATH, synthetic_scores, write_scores
+
+
+def radar(models, table) -> go.Figure:
+    theta = CRITERIA + [CRITERIA[0]]
+    fig = go.Figure()
+    for model in models:
+        scores = table.loc[model, CRITERIA].tolist()
+        fig.add_trace(go.Scatterpolar(r=scores + [scores[0]], theta=theta, fill="toself", name=model))
+    fig.update_layout(polar=dict(radialaxis=dict(visible=True, range=[0, 5])))
+    return fig
+
+
+def figure_cost(table, selected: int = 5) -> dict:
+    """Opbouwtijd en JSON-grootte: een radar per model tegenover één overlay van ``selected`` modellen."""
+    start = time.perf_counter()
+    per_model = sum(len(radar([model], table).to_json()) for model in table.index)
+    per_model_ms = (time.perf_counter() - start) * 1000
+    start = time.perf_counter()
+    overlay = len(radar(table.index[:selected], table).to_json())
+    overlay_ms = (time.perf_counter() - start) * 1000
+    return {
+        "per_model_ms": per_model_ms,
+        "per_model_kib": per_model / 1024,
+        "overlay_ms": overlay_ms,
+        "overlay_kib": overlay / 1024,
+    }
+
+
+def render(path: Path, reruns: int) -> dict:
+    command = [sys.executable, "-m", "benchmarks.leaderboard", "--worker", "--reruns", str(reruns)]
+    env = {**os.environ, "TTS_SCORES": str(path)}
+    output = subprocess.run(command, env=env, check=True, capture_output=True, text=True).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--models", type=int, nargs="+", default=[1000])
+    parser.add_argument("--reruns", type=int, default=10)
+    parser.add_argument("--worker", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.worker:
+        from benchmarks.app_rerun import measure
+
+        print(json.dumps(measure(Path("app.py"), args.reruns, bandwidth_mbit=10.0)))
+        return
+
+    from tts.scores import load_scores
+
+    print(f"{'modellen':>9} {'koud ms':>8} {'rerun ms':>9} | {'radar per model':>22} | {'overlay-radar':>18}")
+    with tempfile.TemporaryDirectory() as tmp:
+        tables = {"5 (echt)": DEFAULT_PATH}
+        for n in args.models:
+            tables[str(n)] = Path(tmp) / f"scores_{n}.parquet"
+            write_scores(synthetic_scores(n), tables[str(n)])
+        for name, path in tables.items():
+            page = render(path, args.reruns)
+            cost = figure_cost(load_scores(path))
+            print(
+                f"{name:>9} {page['cold_ms']:>8.0f} {page['median_ms']:>9.1f} | "
+                f"{cost['per_model_ms']:>8.0f} ms {cost['per_model_kib']:>7.0f} KiB | "
+                f"{cost['overlay_ms']:>5.1f} ms {cost['overlay_kib']:>5.0f} KiB"
+            )
+
+
+if __name__ == "__main__":
+    main()
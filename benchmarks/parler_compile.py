@@ -0,0 +1,146 @@
+# Eager tegen gecompileerd decoderen met Parler-TTS: latency tegen lengte, tokens per seconde en
+# een controle dat de snelle modus dezelfde audio oplevert.
+#
+#     python -m benchmarks.parler_compile                       # resultaten naar results/parler_compile.json
+#     python -m benchmarks.parler_compile --sentences 1 2 4 --repeat 3
+#
+# Het model draait drie keer voor teksten van oplopende lengte, steeds greedy in plaats van
+# gesampled, zodat verschillen niet uit andere trekkingen komen:
+#
+# 1. eager zoals in productie (compile=False, invoer zonder opvulling);
+# 2. eager met de invoer van de snelle modus: beschrijving en prompt opgevuld tot hun bucket, met
+#    attention masks;
+# 3. de snelle modus zelf (statische KV-cache, torch.compile, zie ParlerBackend).
+#
+# De golfvormen worden vergeleken met tts.quantize.snr_db en log_spectral_distance. Twee poorten:
+# 3 tegen 2 meet alleen compileren en de statische cache en moet vrijwel exact zijn; 3 tegen 1 is
+# wat een gebruiker merkt van de hele snelle modus, opvulling inbegrepen, en krijgt ruimere
+# drempels. Het script eindigt met exitcode 1 als een van beide poorten faalt, zodat het als
+# regressiepoort kan dienen. De versnelling wordt gemeten tegen run 1.
+
+import argparse
+import datetime
+import json
+import statistics
+import sys
+import time
+from pathlib import Path
+
+import torch
+
+from tts.backends import ParlerBackend
+from tts.prompts import PROMPTS
+from tts.quantize import log_spectral_distance, snr_db
+
+DEFAULT_OUTPUT = Path("results/parler_compile.json")
+
+
+def texts_by_length(sentences: list[int]) -> list[str]:
+    """Teksten van oplopende lengte: de eerste ``n`` zinnen uit de vaste zinnenset achter elkaar."""
+    return [" ".join(PROMPTS[:n]) for n in sentences]
+
+
+def run(backend, texts: list[str], repeat: int):
+    """Audio en mediane latency per tekst."""
+    audio, latencies = [], []
+    for text in texts:
+        runs = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            speech = backend.synthesize(text)
+            runs.append(time.perf_counter() - start)
+        audio.append(speech)
+        latencies.append(statistics.median(runs))
+    return audio, latencies
+
+
+def compare(reference, candidate, min_snr: float, max_lsd: float):
+    """SNR en log-spectrale afstand van ``candidate`` tegen ``reference``, en of ze binnen de drempels vallen."""
+    snr = snr_db(reference.audio, candidate.audio)
+    lsd = log_spectral_distance(reference.audio, candidate.audio)
+    return snr, lsd, snr >= min_snr and lsd <= max_lsd
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sentences", type=int, nargs="+", default=[1, 2, 3], help="aantal zinnen per tekst")
+    parser.add_argument("--repeat", type=int, default=2)
+    parser.add_argument("--mode", default="default", help="modus voor torch.compile")
+    parser.add_argument("--min-snr", type=float, default=20.0, help="minimale SNR in dB tegen gepad eager")
+    parser.add_argument("--max-lsd", type=float, default=2.0, help="maximale log-spectrale afstand in dB")
+    parser.add_argument("--min-snr-eager", type=float, default=10.0, help="minimale SNR in dB tegen productie-eager")
+    parser.add_argument("--max-lsd-eager", type=float, default=4.0, help="maximale LSD in dB tegen productie-eager")
+    parser.add_argument("--output", type=Path, default=DEFAULT_OUTPUT)
+    args = parser.parse_args(argv)
+
+    texts = texts_by_length(args.sentences)
+    backend = ParlerBackend()
+    backend.load()
+    backend.model.generation_config.do_sample = False
+    # 1. Eager zoals in productie
+    eager_audio, eager_latency = run(backend, texts, args.repeat)
+    # 2. Eager met de gepadde invoer van de snelle modus: compile=True zonder _compile() vult alleen op
+    backend.compile = True
+    padded_audio, padded_latency = run(backend, texts, args.repeat)
+
+    # 3. Hetzelfde model omzetten naar de snelle modus; het opwarmen per bucket apart meten
+    start = time.perf_counter()
+    backend.compile_mode = args.mode
+    backend._compile()
+    warmup = time.perf_counter() - start
+    compiled_audio, compiled_latency = run(backend, texts, args.repeat)
+
+    rows, failed = [], False
+    print(f"opwarmen en compileren: {warmup:.1f} s")
+    print(f"{'tekens':>6} {'bucket':>6} {'eager ms':>9} {'gepad ms':>9} {'compiled ms':>11} {'eager tok/s':>11} "
+          f"{'compiled tok/s':>14} {'SNR':>6} {'LSD':>5} {'SNR e':>6} {'LSD e':>5}  poort")
+    for text, eager, padded, compiled, t_eager, t_padded, t_compiled in zip(
+        texts, eager_audio, padded_audio, compiled_audio, eager_latency, padded_latency, compiled_latency
+    ):
+        tokens = len(backend.tokenizer(text).input_ids)
+        snr, lsd, ok_padded = compare(padded, compiled, args.min_snr, args.max_lsd)
+        snr_eager, lsd_eager, ok_eager = compare(eager, compiled, args.min_snr_eager, args.max_lsd_eager)
+        # Tokens per seconde: gegenereerde audiotokens gedeeld door de rekentijd
+        eager_rate = eager.duration * backend.frame_rate / t_eager
+        compiled_rate = compiled.duration * backend.frame_rate / t_compiled
+        ok = ok_padded and ok_eager
+        failed |= not ok
+        rows.append({
+            "chars": len(text),
+            "prompt_tokens": tokens,
+            "bucket": backend.bucket(tokens),
+            "eager_ms": t_eager * 1000,
+            "padded_ms": t_padded * 1000,
+            "compiled_ms": t_compiled * 1000,
+            "eager_tokens_per_s": eager_rate,
+            "compiled_tokens_per_s": compiled_rate,
+            "snr_db": snr,
+            "lsd_db": lsd,
+            "eager_snr_db": snr_eager,
+            "eager_lsd_db": lsd_eager,
+            "ok": ok,
+        })
+        print(
+            f"{len(text):>6} {backend.bucket(tokens):>6} {t_eager * 1000:>9.0f} {t_padded * 1000:>9.0f} "
+            f"{t_compiled * 1000:>11.0f} {eager_rate:>11.1f} {compiled_rate:>14.1f} {snr:>6.1f} {lsd:>5.2f} "
+            f"{snr_eager:>6.1f} {lsd_eager:>5.2f}  {'ok' if ok else 'MISLUKT'}"
+        )
+
+    report = {
+        "created": datetime.datetime.now().isoformat(timespec="seconds"),
+        "torch": torch.__version__,
+        "compile_mode": args.mode,
+        "warmup_s": warmup,
+        "repeat": args.repeat,
+        "lengths": rows,
+    }
+    args.output.parent.mkdir(parents=True, exist_ok=True)
+    args.output.write_text(json.dumps(report, indent=2))
+
+    if failed:
+        print("Gecompileerde uitvoer wijkt te veel af van eager", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+# Latencywinst van de cache met gecodeerde sprekerbeschrijvingen voor Parler-TTS.
+#
+#     python -m benchmarks.presets                          # alle presets, resultaten naar results/presets.json
+#     python -m benchmarks.presets --presets mark --repeat 3
+#
+# Dezelfde zinnen worden twee keer gegenereerd: zonder cache (elke uiting codeert de beschrijving
+# opnieuw, zoals media/1.py) en met de DescriptionCache uit tts.presets. Per uiting worden de
+# mediane latency en de tijd in de tekst-encoder gerapporteerd, samen met het trefferpercentage en
+# de encodertijd die de cache heeft bespaard.
+
+import argparse
+import datetime
+import json
+import statistics
+import time
+from pathlib import Path
+
+import torch
+
+from tts.backends import ParlerBackend
+from tts.presets import PRESETS, DescriptionCache
+from tts.profiling import profile
+from tts.prompts import PROMPTS
+
+DEFAULT_OUTPUT = Path("results/presets.json")
+
+
+def run(backend, texts: list[str], presets: list[str], repeat: int) -> dict:
+    """Mediane latency en encodertijd per uiting over alle teksten en presets."""
+    latencies, encoder = [], []
+    for _ in range(repeat):
+        for i, text in enumerate(texts):
+            for preset in presets:
+                torch.manual_seed(i)
+                with profile() as p:
+                    start = time.perf_counter()
+                    backend.synthesize(text, preset=preset)
+                    latencies.append(time.perf_counter() - start)
+                encoder.append(p.stages["encoder"].wall if "encoder" in p.stages else 0.0)
+    return {
+        "latency_ms": statistics.median(latencies) * 1000,
+        "encoder_ms": statistics.mean(encoder) * 1000,
+        "utterances": len(latencies),
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--presets", nargs="+", choices=list(PRESETS), default=list(PRESETS))
+    parser.add_argument("--sentences", type=int, default=4, help="aantal zinnen uit de vaste zinnenset")
+    parser.add_argument("--repeat", type=int, default=2)
+    parser.add_argument("--output", type=Path, default=DEFAULT_OUTPUT)
+    args = parser.parse_args(argv)
+
+    texts = PROMPTS[: args.sentences]
+    backend = ParlerBackend()
+    backend.load()
+    backend.synthesize(texts[0])  # Opwarmen
+
+    # Zonder cache: een cache van nul plaatsen codeert elke beschrijving opnieuw
+    backend.descriptions = DescriptionCache(max_entries=0)
+    uncached = run(backend, texts, args.presets, args.repeat)
+
+    backend.descriptions = DescriptionCache()
+    cached = run(backend, texts, args.presets, args.repeat)
+    stats = backend.descriptions.stats
+
+    saved_per_utterance = stats.saved_seconds / cached["utterances"] * 1000
+    print(f"{'':<12} {'latency ms':>11} {'encoder ms':>11}")
+    print(f"{'zonder cache':<12} {uncached['latency_ms']:>11.0f} {uncached['encoder_ms']:>11.1f}")
+    print(f"{'met cache':<12} {cached['latency_ms']:>11.0f} {cached['encoder_ms']:>11.1f}")
+    print(
+        f"Treffers {stats.hits}/{stats.hits + stats.misses} ({stats.hit_rate:.0%}), "
+        f"bespaard {stats.saved_seconds:.2f} s encodertijd, {saved_per_utterance:.1f} ms per uiting"
+    )
+
+    report = {
+        "created": datetime.datetime.now().isoformat(timespec="seconds"),
+        "presets": args.presets,
+        "uncached": uncached,
+        "cached": cached,
+        "hit_rate": stats.hit_rate,
+        "saved_seconds": stats.saved_seconds,
+        "saved_ms_per_utterance": saved_per_utterance,
+    }
+    args.output.parent.mkdir(parents=True, exist_ok=True)
+    args.output.write_text(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,186 @@
+# Kwaliteitspoort en meting voor gekwantiseerde inferentie van de VITS-backends.
+#
+#     python -m benchmarks.quantization                                  # klein willekeurig VITS-model, geen downloads
+#     python -m benchmarks.quantization --model mms-tts-nld --precision int8
+#
+# Elke precisie wordt op de vaste zinnenset gedraaid en vergeleken met de fp32-golfvorm (SNR en
+# log-spectrale afstand). De vergelijking is deterministisch: de ruis in de duurvoorspeller en de
+# prior staat op nul, en elke variant krijgt de door fp32 voorspelde duren opgelegd, zodat een
+# afgerond frame meer of minder de golfvormen niet tegen elkaar verschuift. Hoeveel de eigen
+# duurvoorspelling van een variant afwijkt, wordt apart gemeten en begrensd. Het script eindigt met
+# exitcode 1 als een precisie de drempels niet haalt, zodat het in CI als regressiepoort kan
+# dienen. Daarnaast: versnelling, modelgrootte (geserialiseerde state_dict) en de toename van het
+# residente geheugen per variant.
+
+import argparse
+import copy
+import gc
+import statistics
+import sys
+import time
+
+import torch
+
+from tts.profiling import current_rss
+from tts.prompts import PROMPTS
+from tts.quantize import log_spectral_distance, quantize, serialized_size, snr_db
+
+# Standaarddrempels per precisie, bij opgelegde fp32-duren. Ter vergelijking: een model met andere
+# willekeurige gewichten haalt een SNR onder 0 dB en een LSD rond 8 dB, witte ruis rond 9 dB.
+# max_duration is de grootste relatieve afwijking van de eigen voorspelde totale duur.
+THRESHOLDS = {
+    "int8": {"min_snr_db": 30.0, "max_lsd_db": 0.5, "max_duration": 0.02},
+    "bf16": {"min_snr_db": 25.0, "max_lsd_db": 1.5, "max_duration": 0.05},
+}
+
+
+def tiny_vits():
+    """Klein willekeurig geïnitialiseerd VITS-model plus een tokenizer-vervanger, voor CI zonder downloads."""
+    from transformers import VitsConfig, VitsModel
+
+    torch.manual_seed(0)
+    config = VitsConfig(
+        vocab_size=40,
+        hidden_size=64,
+        num_hidden_layers=2,
+        num_attention_heads=2,
+        ffn_dim=128,
+        flow_size=32,
+        spectrogram_bins=65,
+        upsample_initial_channel=64,
+        upsample_rates=[8, 4],
+        upsample_kernel_sizes=[16, 8],
+        resblock_kernel_sizes=[3],
+        resblock_dilation_sizes=[[1, 3]],
+        prior_encoder_num_flows=2,
+        duration_predictor_num_flows=2,
+        depth_separable_num_layers=2,
+        duration_predictor_filter_channels=64,
+        sampling_rate=16000,
+    )
+
+    def tokenize(text):
+        ids = torch.tensor([[ord(c) % (config.vocab_size - 1) + 1 for c in text]])
+        return {"input_ids": ids, "attention_mask": torch.ones_like(ids)}
+
+    return VitsModel(config).eval(), tokenize
+
+
+def pretrained(model_name):
+    from tts.backends import BACKENDS
+
+    backend = BACKENDS[model_name]()
+    backend.load()
+
+    def tokenize(text):
+        return backend.tokenizer(text, return_tensors="pt")
+
+    return backend.model, tokenize
+
+
+def deterministic(model):
+    """Zet de ruis van de duurvoorspeller en de prior op nul, zodat dezelfde invoer dezelfde golfvorm geeft."""
+    model.noise_scale = 0.0
+    model.noise_scale_duration = 0.0
+    return model
+
+
+def run(model, tokenize, repeat: int, durations: list | None = None):
+    """Golfvormen, eigen voorspelde log-duren en mediane latency over de zinnenset.
+
+    Met ``durations`` krijgt het model per zin die log-duren opgelegd in plaats van zijn eigen voorspelling.
+    """
+    waveforms, predicted, latencies = [], [], []
+    current = {}
+
+    def hook(module, args, output):
+        # De eigen voorspelling één keer per zin bewaren, vóórdat die eventueel wordt vervangen
+        if len(predicted) == current["index"]:
+            predicted.append(output.float())
+        if durations is not None:
+            return durations[current["index"]].to(output.dtype)
+
+    handle = model.duration_predictor.register_forward_hook(hook)
+    try:
+        with torch.no_grad():
+            for i, prompt in enumerate(PROMPTS):
+                current["index"] = i
+                inputs = tokenize(prompt)
+                for _ in range(repeat):
+                    start = time.perf_counter()
+                    waveform = model(**inputs).waveform
+                    latencies.append(time.perf_counter() - start)
+                waveforms.append(waveform[0].float().numpy())
+    finally:
+        handle.remove()
+    return waveforms, predicted, statistics.median(latencies)
+
+
+def duration_error(reference: list, test: list) -> float:
+    """Grootste relatieve afwijking van de totale voorspelde duur (in frames) over de zinnen."""
+    errors = []
+    for ref, other in zip(reference, test):
+        frames_ref = torch.ceil(torch.exp(ref)).sum()
+        frames_test = torch.ceil(torch.exp(other)).sum()
+        errors.append(abs(float(frames_test - frames_ref)) / float(frames_ref))
+    return max(errors)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--model", help="naam van een VITS-backend; zonder deze optie een klein willekeurig model")
+    parser.add_argument("--precision", nargs="+", choices=list(THRESHOLDS), default=list(THRESHOLDS))
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--min-snr", type=float, help="overschrijf de minimale SNR in dB")
+    parser.add_argument("--max-lsd", type=float, help="overschrijf de maximale log-spectrale afstand in dB")
+    args = parser.parse_args(argv)
+
+    # Eerst transformers importeren, zodat dat niet in het geheugen van het fp32-model meetelt
+    import transformers.models.vits.modeling_vits  # noqa: F401
+
+    gc.collect()
+    rss_before = current_rss()
+    reference, tokenize = pretrained(args.model) if args.model else tiny_vits()
+    rss_reference = current_rss()
+    deterministic(reference)
+    reference_waveforms, reference_durations, reference_latency = run(reference, tokenize, args.repeat)
+
+    print(f"{'precisie':<9} {'latency ms':>10} {'versnelling':>11} {'grootte MB':>10} {'RSS MB':>7} "
+          f"{'min SNR':>8} {'max LSD':>8} {'duur':>6}  poort")
+    size = serialized_size(reference)
+    rss = (rss_reference - rss_before) / 1e6
+    print(f"{'fp32':<9} {reference_latency * 1000:>10.1f} {1:>11.2f} {size / 1e6:>10.2f} {rss:>7.1f}")
+
+    failed = []
+    for precision in args.precision:
+        gc.collect()
+        rss_before = current_rss()
+        model = deterministic(quantize(copy.deepcopy(reference), precision))
+        rss_after = current_rss()
+        waveforms, durations, latency = run(model, tokenize, args.repeat, durations=reference_durations)
+
+        snr = min(snr_db(ref, test) for ref, test in zip(reference_waveforms, waveforms))
+        lsd = max(log_spectral_distance(ref, test) for ref, test in zip(reference_waveforms, waveforms))
+        duration = duration_error(reference_durations, durations)
+        thresholds = THRESHOLDS[precision]
+        min_snr = args.min_snr if args.min_snr is not None else thresholds["min_snr_db"]
+        max_lsd = args.max_lsd if args.max_lsd is not None else thresholds["max_lsd_db"]
+        ok = snr >= min_snr and lsd <= max_lsd and duration <= thresholds["max_duration"]
+        if not ok:
+            failed.append(precision)
+
+        size = serialized_size(model)
+        rss = (rss_after - rss_before) / 1e6
+        print(
+            f"{precision:<9} {latency * 1000:>10.1f} {reference_latency / latency:>11.2f} {size / 1e6:>10.2f} "
+            f"{rss:>7.1f} {snr:>8.1f} {lsd:>8.2f} {duration:>6.1%}  {'ok' if ok else 'MISLUKT'}"
+        )
+        del model
+
+    if failed:
+        print(f"Kwaliteitspoort mislukt voor: {', '.join(failed)}", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
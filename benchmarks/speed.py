@@ -0,0 +1,159 @@
+# Reproduceerbare snelheids- en resourcemeting van alle vijf modellen uit media/.
+#
+#     python -m benchmarks.speed                       # alle modellen, resultaten naar results/benchmark.json
+#     python -m benchmarks.speed --models mms-tts-nld --threads 1 2 4
+#
+# Elk model wordt in een eigen subproces gemeten, zodat de koude laadtijd en het piekgeheugen (RSS)
+# niet beïnvloed worden door eerder geladen modellen. De OpenAI-backend praat met de lokale stub
+# uit tts.openai_stub in plaats van met de echte API. Een model dat faalt (bijvoorbeeld Parler-TTS
+# zonder het pakket parler_tts) breekt de run niet af, maar komt met zijn foutmelding in het rapport.
+#
+# Per model: koude laadtijd, warme latency (p50/p90/p99) over de vaste Nederlandse zinnenset,
+# real-time factor, piek-RSS en de latency van de enquêtezin bij verschillende aantallen CPU-threads.
+
+import argparse
+import datetime
+import json
+import os
+import platform
+import resource
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+from tts.backends import BACKENDS, OpenAIBackend
+from tts.prompts import PROMPT, PROMPTS
+
+DEFAULT_OUTPUT = Path("results/benchmark.json")
+
+
+def peak_rss_mb() -> float:
+    # ru_maxrss is in kilobytes op Linux en in bytes op macOS
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / 1024**2 if sys.platform == "darwin" else peak / 1024
+
+
+def measure_model(model: str, repeat: int, threads: list[int]) -> dict:
+    """Meet één model in het huidige proces."""
+    from tts import Engine
+
+    engine = Engine()
+    start = time.perf_counter()
+    backend = engine.pool.get(model)
+    cold_load = time.perf_counter() - start
+
+    # Eerste synthese apart houden: die bevat nog eenmalige initialisatie
+    engine.synthesize(PROMPTS[0], model=model)
+
+    latencies, audio_seconds = [], 0.0
+    for _ in range(repeat):
+        for prompt in PROMPTS:
+            start = time.perf_counter()
+            speech = engine.synthesize(prompt, model=model)
+            latencies.append(time.perf_counter() - start)
+            audio_seconds += speech.duration
+    p50, p90, p99 = np.percentile(latencies, [50, 90, 99]) * 1000
+
+    scaling = {}
+    if not issubclass(BACKENDS[model], OpenAIBackend):
+        import torch
+
+        default_threads = torch.get_num_threads()
+        for n in threads:
+            torch.set_num_threads(n)
+            runs = []
+            for _ in range(3):
+                start = time.perf_counter()
+                engine.synthesize(PROMPT, model=model)
+                runs.append(time.perf_counter() - start)
+            scaling[str(n)] = float(np.median(runs) * 1000)
+        torch.set_num_threads(default_threads)
+
+    return {
+        "model": model,
+        "model_id": backend.model_id,
+        "cold_load_s": cold_load,
+        "p50_ms": float(p50),
+        "p90_ms": float(p90),
+        "p99_ms": float(p99),
+        "rtf": sum(latencies) / audio_seconds,
+        "peak_rss_mb": peak_rss_mb(),
+        "threads_ms": scaling,
+    }
+
+
+def run_isolated(model: str, repeat: int, threads: list[int], env: dict) -> dict:
+    command = [
+        sys.executable, "-m", "benchmarks.speed", "--worker", model,
+        "--repeat", str(repeat), "--threads", *map(str, threads),
+    ]
+    try:
+        output = subprocess.run(command, env=env, check=True, capture_output=True, text=True).stdout
+    except subprocess.CalledProcessError as exc:
+        # De laatste regel van stderr is de melding van de exceptie; de traceback zelf gaat naar de console
+        print(exc.stderr, file=sys.stderr)
+        lines = exc.stderr.strip().splitlines()
+        return {"model": model, "error": lines[-1] if lines else f"exitcode {exc.returncode}"}
+    # De laatste regel van de uitvoer is het JSON-resultaat; eerdere regels zijn meldingen van bibliotheken
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def machine_info() -> dict:
+    info = {"platform": platform.platform(), "python": platform.python_version(), "cpu_count": os.cpu_count()}
+    try:
+        import torch
+
+        info["torch"] = torch.__version__
+    except ImportError:
+        pass
+    return info
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--models", nargs="+", default=list(BACKENDS))
+    parser.add_argument("--repeat", type=int, default=3, help="hoe vaak de zinnenset herhaald wordt")
+    parser.add_argument("--threads", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--output", type=Path, default=DEFAULT_OUTPUT)
+    parser.add_argument("--worker", help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.worker:
+        print(json.dumps(measure_model(args.worker, args.repeat, args.threads)))
+        return
+
+    from tts.openai_stub import serve
+
+    results = []
+    with serve() as stub_url:
+        env = {**os.environ, "OPENAI_BASE_URL": stub_url, "OPENAI_API_KEY": "stub"}
+        for model in args.models:
+            print(f"Meten: {model}", file=sys.stderr)
+            results.append(run_isolated(model, args.repeat, args.threads, env))
+
+    report = {
+        "created": datetime.datetime.now().isoformat(timespec="seconds"),
+        "machine": machine_info(),
+        "prompts": len(PROMPTS),
+        "repeat": args.repeat,
+        "models": results,
+    }
+    args.output.parent.mkdir(parents=True, exist_ok=True)
+    args.output.write_text(json.dumps(report, indent=2))
+
+    print(f"{'model':<46} {'laden s':>8} {'p50 ms':>8} {'p99 ms':>8} {'RTF':>7} {'RSS MB':>8}")
+    for r in results:
+        if "error" in r:
+            print(f"{r['model']:<46} MISLUKT: {r['error']}")
+            continue
+        print(
+            f"{r['model']:<46} {r['cold_load_s']:>8.2f} {r['p50_ms']:>8.1f} {r['p99_ms']:>8.1f} "
+            f"{r['rtf']:>7.3f} {r['peak_rss_mb']:>8.0f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+# Tijdsverdeling per fase (tokenisatie, encoder, decoder, vocoder, ...) voor alle modellen.
+#
+#     python -m benchmarks.stages                             # resultaten naar results/stages.json
+#     python -m benchmarks.stages --models mms-tts-nld --trace results/traces
+#
+# Per model wordt de vaste zinnenset gegenereerd en weggeschreven onder tts.profiling.profile; de
+# tijden zijn gemiddelden per uiting. Met --trace komt er per model ook een Chrome-trace van één
+# synthese van de enquêtezin bij (te openen in chrome://tracing of https://ui.perfetto.dev). De
+# OpenAI-backend praat met de lokale stub uit tts.openai_stub.
+
+import argparse
+import datetime
+import json
+import os
+import sys
+import tempfile
+from collections import defaultdict
+from pathlib import Path
+
+from tts.backends import BACKENDS
+from tts.profiling import profile
+from tts.prompts import PROMPT, PROMPTS
+
+DEFAULT_OUTPUT = Path("results/stages.json")
+
+
+def measure_model(engine, model: str, repeat: int, trace_dir: Path | None) -> dict:
+    """Gemiddelde tijd per fase en per uiting voor één model."""
+    # Eerste synthese apart houden: die bevat nog eenmalige initialisatie
+    engine.synthesize(PROMPTS[0], model=model)
+
+    totals = defaultdict(lambda: defaultdict(float))
+    wall = cpu = 0.0
+    runs = 0
+    with tempfile.TemporaryDirectory() as tmp:
+        for _ in range(repeat):
+            for i, prompt in enumerate(PROMPTS):
+                with profile() as p:
+                    engine.synthesize(prompt, model=model).write(Path(tmp) / f"{i}.wav")
+                for name, timing in p.breakdown().items():
+                    for field in ("wall_ms", "cpu_ms", "memory_mb"):
+                        totals[name][field] += timing[field]
+                wall += p.wall
+                cpu += p.cpu
+                runs += 1
+
+        trace = None
+        if trace_dir is not None:
+            trace_dir.mkdir(parents=True, exist_ok=True)
+            trace = trace_dir / f"{model}.json"
+            with profile(trace=trace):
+                engine.synthesize(PROMPT, model=model).write(Path(tmp) / "trace.wav")
+
+    return {
+        "model": model,
+        "wall_ms": wall / runs * 1000,
+        "cpu_ms": cpu / runs * 1000,
+        "stages": {name: {field: value / runs for field, value in fields.items()} for name, fields in totals.items()},
+        "trace": str(trace) if trace else None,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--models", nargs="+", default=list(BACKENDS))
+    parser.add_argument("--repeat", type=int, default=2, help="hoe vaak de zinnenset herhaald wordt")
+    parser.add_argument("--output", type=Path, default=DEFAULT_OUTPUT)
+    parser.add_argument("--trace", type=Path, help="map voor een Chrome-trace per model")
+    args = parser.parse_args(argv)
+
+    from tts import Engine
+    from tts.openai_stub import serve
+
+    # Zonder schijfcache: een cachetreffer zou alle fasen overslaan
+    engine = Engine()
+    results = []
+    with serve() as stub_url:
+        os.environ.update(OPENAI_BASE_URL=stub_url, OPENAI_API_KEY="stub")
+        for model in args.models:
+            print(f"Meten: {model}", file=sys.stderr)
+            results.append(measure_model(engine, model, args.repeat, args.trace))
+
+    report = {
+        "created": datetime.datetime.now().isoformat(timespec="seconds"),
+        "prompts": len(PROMPTS),
+        "repeat": args.repeat,
+        "models": results,
+    }
+    args.output.parent.mkdir(parents=True, exist_ok=True)
+    args.output.write_text(json.dumps(report, indent=2))
+
+    for r in results:
+        print(f"{r['model']}: {r['wall_ms']:.1f} ms wand, {r['cpu_ms']:.1f} ms CPU per uiting")
+        for name, timing in r["stages"].items():
+            print(f"    {name:<10} {timing['wall_ms']:>9.1f} ms {timing['wall_ms'] / r['wall_ms']:>6.0%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+# Doorvoer van de multi-process synthese voor combinaties van workers × threads per worker.
+#
+#     python -m benchmarks.workers --model mms-tts-nld --workers 1 2 4 --threads 1 2 4
+#
+# Schrijft per combinatie het aantal uitingen per seconde naar results/workers.json. app.py toont
+# daaruit de doorvoercurves: uitingen/s tegen het aantal workers, één curve per threadbudget.
+
+import argparse
+import datetime
+import json
+import os
+import time
+from pathlib import Path
+
+from tts.prompts import PROMPTS
+from tts.workers import SynthesisWorkers
+
+DEFAULT_OUTPUT = Path("results/workers.json")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--model", default="mms-tts-nld")
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--threads", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--repeat", type=int, default=4, help="hoe vaak de vaste zinnenset herhaald wordt")
+    parser.add_argument("--output", type=Path, default=DEFAULT_OUTPUT)
+    args = parser.parse_args(argv)
+
+    texts = PROMPTS * args.repeat
+    results = []
+    print(f"{args.model}: {len(texts)} uitingen, {os.cpu_count()} CPU's")
+    print(f"{'workers':>8} {'threads':>8} {'utt/s':>8}")
+    for threads in args.threads:
+        for workers in args.workers:
+            with SynthesisWorkers(args.model, workers=workers, threads_per_worker=threads) as pool:
+                list(pool.map(PROMPTS[:workers]))  # Opwarmen: elke worker één keer
+                start = time.perf_counter()
+                for _ in pool.map(texts):
+                    pass
+                elapsed = time.perf_counter() - start
+            results.append({"workers": workers, "threads": threads, "utterances_per_sec": len(texts) / elapsed})
+            print(f"{workers:>8} {threads:>8} {len(texts) / elapsed:>8.2f}")
+
+    args.output.parent.mkdir(parents=True, exist_ok=True)
+    args.output.write_text(json.dumps(
+        {
+            "created": datetime.datetime.now().isoformat(timespec="seconds"),
+            "model": args.model,
+            "cpu_count": os.cpu_count(),
+            "utterances": len(texts),
+            "results": results,
+        },
+        indent=2,
+    ))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,36 @@
+# Draait de kwaliteitspoort uit benchmarks/quantization.py op het kleine willekeurige VITS-model,
+# zodat een regressie in tts.quantize in de gewone testrun opvalt. Geen downloads nodig.
+
+import pytest
+
+torch = pytest.importorskip("torch")
+pytest.importorskip("transformers")
+
+from benchmarks import quantization  # noqa: E402
+from tts.backends import Backend  # noqa: E402
+from tts.quantize import quantize  # noqa: E402
+
+
+def test_quality_gate_passes_on_tiny_model():
+    # main() eindigt met sys.exit(1) als een precisie de drempels niet haalt
+    quantization.main(["--repeat", "1"])
+
+
+class _Wrapped(Backend):
+    name = "wrapped"
+    model_id = "wrapped"
+
+    def __init__(self, model):
+        super().__init__()
+        self.model = model
+
+    def modules(self):
+        return [self.model]
+
+
+def test_nbytes_counts_packed_int8_weights():
+    model = torch.nn.Sequential(torch.nn.Linear(256, 256), torch.nn.LayerNorm(256))
+    int8 = _Wrapped(quantize(model, "int8")).nbytes()
+    # 256×256 INT8-gewichten plus fp32-bias en LayerNorm
+    assert int8 >= 256 * 256 + 3 * 256 * 4
+    assert int8 < _Wrapped(model).nbytes()
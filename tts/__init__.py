@@ -0,0 +1,21 @@
+# Offline Nederlandse tekst-naar-spraak: de modellen uit de blogpost als herbruikbare bibliotheek.
+
+from .backends import BACKENDS, Backend, Speech, register_backend
+from .cache import SynthesisCache
+from .engine import Engine, get_engine, stream, stream_pcm, synthesize, synthesize_batch
+from .pool import ModelPool
+
+__all__ = [
+    "BACKENDS",
+    "Backend",
+    "Engine",
+    "ModelPool",
+    "Speech",
+    "SynthesisCache",
+    "get_engine",
+    "register_backend",
+    "stream",
+    "stream_pcm",
+    "synthesize",
+    "synthesize_batch",
+]
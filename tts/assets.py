@@ -0,0 +1,72 @@
+# Eenmalige omzetting van de WAV-fragmenten naar een compact formaat voor de resultatenpagina.
+#
+# De ongecomprimeerde WAV's in media/ zijn samen ruim 3 MB. OGG Vorbis is voor spraak een factor
+# tien kleiner en wordt door alle gangbare browsers afgespeeld. Het resultaat wordt bewaard onder
+# de SHA-256 van het bronbestand, zodat een gewijzigde WAV vanzelf opnieuw wordt omgezet en een
+# ongewijzigde nooit twee keer.
+#
+#     python -m tts.assets media/*.wav    # vooraf omzetten en de besparing tonen
+
+import argparse
+import hashlib
+import os
+from pathlib import Path
+
+from .cache import atomic_write
+
+DEFAULT_DIR = Path(os.environ.get("TTS_ASSET_DIR", Path.home() / ".cache" / "tts-nl" / "assets"))
+
+# Bestandsextensie en soundfile-instellingen per doelformaat
+FORMATS = {
+    "ogg": ("OGG", "VORBIS"),
+    "flac": ("FLAC", "PCM_16"),
+}
+
+
+def source_hash(path: str | Path) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def transcode(path: str | Path, fmt: str = "ogg", cache_dir: str | Path = DEFAULT_DIR) -> Path:
+    """Geef het pad van de gecomprimeerde versie van ``path``; zet hem om als die nog niet bestaat."""
+    import soundfile as sf
+
+    if fmt not in FORMATS:
+        raise ValueError(f"Onbekend formaat {fmt!r}; kies uit: {', '.join(FORMATS)}")
+    cache_dir = Path(cache_dir)
+    target = cache_dir / f"{source_hash(path)}.{fmt}"
+    if target.exists():
+        return target
+
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    audio, sampling_rate = sf.read(path, dtype="float32")
+    container, subtype = FORMATS[fmt]
+    # Atomair schrijven, zodat een gelijktijdige lezer nooit een half bestand ziet
+    with atomic_write(target) as f:
+        sf.write(f, audio, sampling_rate, format=container, subtype=subtype)
+    return target
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser()
+    parser.add_argument("paths", nargs="+", type=Path)
+    parser.add_argument("--format", choices=FORMATS, default="ogg")
+    parser.add_argument("--dir", type=Path, default=DEFAULT_DIR)
+    args = parser.parse_args(argv)
+
+    total_before = total_after = 0
+    for path in args.paths:
+        target = transcode(path, args.format, args.dir)
+        before, after = path.stat().st_size, target.stat().st_size
+        total_before += before
+        total_after += after
+        print(f"{path}: {before / 1024:.0f} KiB -> {after / 1024:.0f} KiB")
+    print(f"Totaal: {total_before / 1024:.0f} KiB -> {total_after / 1024:.0f} KiB")
+
+
+if __name__ == "__main__":
+    main()
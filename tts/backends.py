@@ -0,0 +1,504 @@
+# De TTS-modellen uit media/1.py t/m media/5.py achter één gemeenschappelijke interface.
+#
+# Elke backend laadt zijn model één keer (load) en kan daarna onbeperkt vaak spraak genereren
+# (synthesize). Zware imports (torch, transformers, parler_tts) gebeuren pas bij het laden, zodat
+# dit pakket ook geïmporteerd kan worden in omgevingen zonder deze afhankelijkheden (zoals app.py).
+
+from typing import NamedTuple
+
+import numpy as np
+
+from .profiling import instrument, instrument_method, stage
+
+
+class Speech(NamedTuple):
+    """Een gegenereerd audiofragment: mono float32-samples plus samplefrequentie."""
+
+    audio: np.ndarray
+    sampling_rate: int
+
+    @property
+    def duration(self) -> float:
+        return len(self.audio) / self.sampling_rate
+
+    def write(self, path) -> None:
+        import soundfile as sf
+
+        with stage("write"):
+            sf.write(path, self.audio, samplerate=self.sampling_rate)
+
+
+# Alle geregistreerde backends, op naam (gelijk aan de kolom "Model" in app.py)
+BACKENDS: dict[str, type["Backend"]] = {}
+
+
+def register_backend(cls):
+    """Class-decorator die een backend onder ``cls.name`` registreert."""
+    BACKENDS[cls.name] = cls
+    return cls
+
+
+class Backend:
+    """Basisklasse voor een TTS-model dat één keer geladen wordt en daarna hergebruikt."""
+
+    name: str
+    model_id: str
+    # Ondersteunde precisies (zie tts.quantize); standaard alleen de volledige fp32-precisie
+    precisions = ("fp32",)
+
+    def __init__(self, device: str = "cpu", revision: str = "main", precision: str = "fp32"):
+        if precision not in self.precisions:
+            raise ValueError(
+                f"{self.name} ondersteunt precisie {precision!r} niet; kies uit: {', '.join(self.precisions)}"
+            )
+        self.device = device
+        self.revision = revision
+        self.precision = precision
+        self.loaded = False
+
+    def load(self) -> None:
+        raise NotImplementedError
+
+    def synthesize(self, text: str, **voice) -> Speech:
+        raise NotImplementedError
+
+    def synthesize_batch(self, texts: list[str], **voice) -> list[Speech]:
+        """Genereer meerdere teksten tegelijk; backends zonder batchmodus doen het één voor één."""
+        return [self.synthesize(text, **voice) for text in texts]
+
+    @classmethod
+    def voice_key(cls, voice: dict) -> dict:
+        """De stemopties zoals ze de audio bepalen, voor de cachesleutel; standaard ongewijzigd."""
+        return voice
+
+    @property
+    def sampling_rate(self) -> int:
+        raise NotImplementedError
+
+    def modules(self) -> list:
+        """De torch-modules van dit model, gebruikt om het geheugengebruik te bepalen."""
+        return []
+
+    def nbytes(self) -> int:
+        """Geheugenvoetafdruk van alle gewichten en buffers in bytes."""
+        total = 0
+        for module in self.modules():
+            for tensor in list(module.parameters()) + list(module.buffers()):
+                total += tensor.numel() * tensor.element_size()
+            # Dynamisch gekwantiseerde lagen (precisie "int8", zie tts.quantize) hebben geen parameters;
+            # hun INT8-gewichten en bias staan als tuple ingepakt in de state_dict
+            for value in module.state_dict().values():
+                if isinstance(value, tuple):
+                    total += sum(t.numel() * t.element_size() for t in value if hasattr(t, "element_size"))
+        return total
+
+    def unload(self) -> None:
+        self.loaded = False
+
+    def __repr__(self):
+        return f"{type(self).__name__}({self.model_id!r}, device={self.device!r})"
+
+
+# Standaard sprekerbeschrijving uit media/1.py
+PARLER_DESCRIPTION = (
+    "Mark levert een licht expressieve en geanimeerde toespraak met een matige snelheid en toonhoogte."
+    "De opname is van zeer hoge kwaliteit, waarbij de stem van de spreker helder en zeer dichtbij klinkt."
+)
+
+
+@register_backend
+class ParlerBackend(Backend):
+    """Parler-TTS uit media/1.py.
+
+    Met ``compile=True`` draait de autoregressieve lus in een snelle modus: een vooraf gealloceerde
+    statische KV-cache, een met ``torch.compile`` gecompileerde forward en prompts die worden
+    opgevuld tot een vaste bucketlengte, zodat elke bucket na het opwarmen dezelfde gecompileerde
+    graaf hergebruikt in plaats van per invoerlengte opnieuw te compileren.
+
+    Sprekerbeschrijvingen worden één keer gecodeerd en in een ``DescriptionCache`` bewaard (zie
+    tts.presets); ``description_dir`` bewaart ze ook op schijf.
+    """
+
+    name = "parler-tts-mini-multilingual-v1.1"
+    model_id = "parler-tts/parler-tts-mini-multilingual-v1.1"
+
+    # Tokenlengtes waarop beschrijving en prompt in de snelle modus worden opgevuld
+    buckets = (16, 32, 64, 128)
+
+    def __init__(
+        self,
+        device="cpu",
+        revision="main",
+        precision="fp32",
+        compile=False,
+        compile_mode="default",
+        description_cache=32,
+        description_dir=None,
+    ):
+        super().__init__(device, revision, precision)
+        self.compile = compile
+        self.compile_mode = compile_mode
+        self.description_cache = description_cache
+        self.description_dir = description_dir
+
+    def load(self):
+        from parler_tts import ParlerTTSForConditionalGeneration
+        from transformers import AutoTokenizer
+
+        from .presets import DescriptionCache
+
+        self.model = ParlerTTSForConditionalGeneration.from_pretrained(
+            self.model_id, revision=self.revision
+        ).to(self.device)
+        self.tokenizer = AutoTokenizer.from_pretrained(self.model_id, revision=self.revision)
+        self.description_tokenizer = AutoTokenizer.from_pretrained(
+            self.model.config.text_encoder._name_or_path
+        )
+        # De generate-lus zelf is de fase "decoder"; de DAC-vocoder wordt via decode aangeroepen
+        instrument(self.model.text_encoder, "encoder")
+        instrument_method(self.model.audio_encoder, "decode", "vocoder")
+        self.descriptions = DescriptionCache(self.description_cache, self.description_dir)
+        self.loaded = True
+        if self.compile:
+            self._compile()
+
+    def _compile(self):
+        import torch
+        from transformers import StaticCache
+
+        from .presets import PRESETS
+
+        # parler_tts 0.2.3 vergelijkt bij het hergebruiken van de cache nog max_batch_size, dat de
+        # vastgepinde transformers 4.46.1 batch_size noemt; zonder dit faalt elke tweede generate
+        if not hasattr(StaticCache, "max_batch_size"):
+            StaticCache.max_batch_size = property(lambda cache: cache.batch_size)
+        self.model.generation_config.cache_implementation = "static"
+        self.model.forward = torch.compile(self.model.forward, mode=self.compile_mode)
+        # Opwarmen, zodat geen gebruiker op het compileren wacht: elke promptbucket met de
+        # standaardbeschrijving, plus de beschrijvingsbucket van elke preset die daar nog niet onder
+        # valt. De modi met CUDA-graphs hebben twee rondes nodig.
+        rounds = 1 if self.compile_mode == "default" else 2
+        warmup = [(PARLER_DESCRIPTION, bucket) for bucket in self.buckets]
+        seen = {self.encode_description(PARLER_DESCRIPTION)[1].shape[-1]}
+        for description in PRESETS.values():
+            length = self.encode_description(description)[1].shape[-1]
+            if length not in seen:
+                seen.add(length)
+                warmup.append((description, self.buckets[0]))
+        for description, bucket in warmup:
+            for _ in range(rounds):
+                self.model.generate(**self._inputs(["opwarmen"], description, prompt_length=bucket))
+
+    def bucket(self, length: int) -> int:
+        """Kleinste bucket waar ``length`` tokens in passen; langer dan de grootste: een veelvoud daarvan."""
+        for bucket in self.buckets:
+            if length <= bucket:
+                return bucket
+        largest = self.buckets[-1]
+        return -(-length // largest) * largest
+
+    def _tokenize(self, tokenizer, texts, length=None):
+        if not self.compile:
+            return tokenizer(texts, return_tensors="pt", padding=True).to(self.device)
+        if length is None:
+            length = self.bucket(max(len(ids) for ids in tokenizer(texts).input_ids))
+        return tokenizer(texts, return_tensors="pt", padding="max_length", max_length=length).to(self.device)
+
+    def encode_description(self, description):
+        """Gecodeerde beschrijving (zoals generate die aan de decoder geeft) en attention mask, uit de cache.
+
+        In de snelle modus worden beide met nullen opgevuld tot een bucketlengte; de cache zelf bewaart
+        de ongepadde vorm, zodat die voor beide modi geldt.
+        """
+        import torch
+
+        from .presets import description_key
+
+        def encode():
+            with stage("tokenize"):
+                tokens = self.description_tokenizer(description, return_tensors="pt").to(self.device)
+            # Dezelfde stap als generate zonder encoder_outputs: tekst-encoder, zo nodig de projectie
+            # enc_to_dec_proj en het vermenigvuldigen met de mask. forward doet dat alleen zelf als
+            # encoder_outputs ontbreekt, dus het moet hier al gebeurd zijn.
+            with torch.no_grad():
+                kwargs = self.model._prepare_text_encoder_kwargs_for_generation(
+                    tokens.input_ids,
+                    {"attention_mask": tokens.attention_mask},
+                    "input_ids",
+                    self.model.generation_config,
+                )
+            return kwargs["encoder_outputs"].last_hidden_state, tokens.attention_mask
+
+        key = description_key(self.model_id, self.revision, description)
+        hidden_states, attention_mask = self.descriptions.get(key, encode)
+        hidden_states, attention_mask = hidden_states.to(self.device), attention_mask.to(self.device)
+        if self.compile:
+            # Opvullen na het coderen is gelijk aan gepadde invoer: gemaskeerde posities zijn al nul
+            padding = self.bucket(attention_mask.shape[-1]) - attention_mask.shape[-1]
+            hidden_states = torch.nn.functional.pad(hidden_states, (0, 0, 0, padding))
+            attention_mask = torch.nn.functional.pad(attention_mask, (0, padding))
+        return hidden_states, attention_mask
+
+    def _inputs(self, texts, description, prompt_length=None):
+        from transformers.modeling_outputs import BaseModelOutput
+
+        # Eén beschrijving voor de hele batch; generate slaat de encoder over als encoder_outputs er al is
+        hidden_states, attention_mask = self.encode_description(description)
+        with stage("tokenize"):
+            prompts = self._tokenize(self.tokenizer, texts, prompt_length)
+        return {
+            "encoder_outputs": BaseModelOutput(last_hidden_state=hidden_states.expand(len(texts), -1, -1)),
+            "attention_mask": attention_mask.expand(len(texts), -1),
+            "prompt_input_ids": prompts.input_ids,
+            "prompt_attention_mask": prompts.attention_mask,
+        }
+
+    @classmethod
+    def voice_key(cls, voice):
+        from .presets import resolve
+
+        # Een preset is een naam voor een beschrijving: de sleutel volgt de beschrijving zelf, zodat
+        # register_preset geen oude audio oplevert en preset="mark" dezelfde sleutel heeft als de tekst
+        voice = dict(voice)
+        voice["description"] = resolve(voice.pop("preset", None), voice.get("description"))
+        return voice
+
+    @property
+    def sampling_rate(self):
+        return self.model.config.sampling_rate
+
+    @property
+    def frame_rate(self) -> float:
+        """Audiotokens per seconde geluid; nodig om tokens per seconde te rapporteren."""
+        return self.model.audio_encoder.config.frame_rate
+
+    def modules(self):
+        return [self.model] if self.loaded else []
+
+    def synthesize(self, text, description=None, preset=None):
+        from transformers.modeling_outputs import BaseModelOutput
+
+        from .presets import resolve
+
+        description = resolve(preset, description)
+        if self.compile:
+            return self.synthesize_batch([text], description)[0]
+        hidden_states, attention_mask = self.encode_description(description)
+        with stage("tokenize"):
+            prompt_input_ids = self.tokenizer(text, return_tensors="pt").input_ids.to(self.device)
+        with stage("decoder"):
+            generation = self.model.generate(
+                encoder_outputs=BaseModelOutput(last_hidden_state=hidden_states),
+                attention_mask=attention_mask,
+                prompt_input_ids=prompt_input_ids,
+            )
+        with stage("to_numpy"):
+            audio = generation.cpu().numpy().squeeze().astype(np.float32)
+        return Speech(audio, self.sampling_rate)
+
+    def synthesize_batch(self, texts, description=None, preset=None):
+        from .presets import resolve
+
+        inputs = self._inputs(texts, resolve(preset, description))
+        with stage("decoder"):
+            generation = self.model.generate(**inputs, return_dict_in_generate=True)
+        # Knip de padding weg: audios_length bevat de echte lengte van elk fragment
+        with stage("to_numpy"):
+            audio = generation.sequences.cpu().numpy().astype(np.float32)
+        return [
+            Speech(audio[i, : int(length)], self.sampling_rate)
+            for i, length in enumerate(generation.audios_length)
+        ]
+
+    def unload(self):
+        del self.model, self.tokenizer, self.description_tokenizer
+        super().unload()
+
+
+@register_backend
+class SpeechT5Backend(Backend):
+    name = "speecht5_finetuned_facebook_voxpopuli_dutch"
+    model_id = "Kodamn47/speecht5_finetuned_facebook_voxpopuli_dutch"
+
+    # Spreker-embedding uit media/2.py
+    default_speaker = 7306
+
+    def load(self):
+        from transformers import pipeline
+
+        from .speakers import SpeakerStore, build_store
+
+        self.synthesiser = pipeline(
+            "text-to-speech", model=self.model_id, revision=self.revision, device=self.device
+        )
+        # De spreker-embeddings komen uit een memory-mapped store; alleen de allereerste keer
+        # wordt die opgebouwd uit de dataset
+        if not SpeakerStore.exists():
+            build_store()
+        self.speakers = SpeakerStore()
+        # Het autoregressieve decoderen in de pipeline is de fase "decoder"
+        instrument_method(self.synthesiser, "preprocess", "tokenize")
+        instrument(self.synthesiser.model.speecht5.encoder, "encoder")
+        if getattr(self.synthesiser, "vocoder", None) is not None:
+            instrument(self.synthesiser.vocoder, "vocoder")
+        self.loaded = True
+
+    @property
+    def sampling_rate(self):
+        return self.synthesiser.sampling_rate
+
+    def modules(self):
+        if not self.loaded:
+            return []
+        return [m for m in (self.synthesiser.model, getattr(self.synthesiser, "vocoder", None)) if m is not None]
+
+    def speaker_embedding(self, speaker):
+        """Embedding op index, bestandsnaam of sprekercode; een view op de store zonder kopie."""
+        import torch
+
+        return torch.from_numpy(self.speakers.get(speaker)).unsqueeze(0)
+
+    def synthesize(self, text, speaker=None, speaker_embedding=None):
+        if speaker_embedding is None:
+            speaker_embedding = self.speaker_embedding(self.default_speaker if speaker is None else speaker)
+        with stage("decoder"):
+            speech = self.synthesiser(text, forward_params={"speaker_embeddings": speaker_embedding})
+        with stage("to_numpy"):
+            audio = np.asarray(speech["audio"], dtype=np.float32).squeeze()
+        return Speech(audio, speech["sampling_rate"])
+
+    def unload(self):
+        del self.synthesiser, self.speakers
+        super().unload()
+
+
+class _WaveformBackend(Backend):
+    """Gemeenschappelijke code voor de VITS-modellen uit media/3.py en media/4.py."""
+
+    precisions = ("fp32", "int8", "bf16")
+
+    # Submodules van VitsModel per fase; de posterior-encoder wordt alleen bij training gebruikt
+    stage_modules = {
+        "text_encoder": "encoder",
+        "duration_predictor": "duration",
+        "flow": "decoder",
+        "decoder": "vocoder",
+    }
+
+    def model_class(self):
+        raise NotImplementedError
+
+    def load(self):
+        from transformers import AutoTokenizer
+
+        from .quantize import quantize
+
+        model = self.model_class().from_pretrained(self.model_id, revision=self.revision).to(self.device)
+        self.model = quantize(model.eval(), self.precision)
+        self.tokenizer = AutoTokenizer.from_pretrained(self.model_id, revision=self.revision)
+        self.instrument()
+        self.loaded = True
+
+    def instrument(self):
+        for child, name in self.stage_modules.items():
+            module = getattr(self.model, child, None)
+            if module is not None:
+                instrument(module, name)
+
+    @property
+    def sampling_rate(self):
+        return self.model.config.sampling_rate
+
+    def modules(self):
+        return [self.model] if self.loaded else []
+
+    def synthesize(self, text):
+        import torch
+
+        with stage("tokenize"):
+            inputs = self.tokenizer(text, return_tensors="pt").to(self.device)
+        with torch.no_grad():  # Schakel gradiëntberekening uit om geheugen te besparen
+            speech = self.model(**inputs).waveform
+        with stage("to_numpy"):
+            audio = speech.squeeze().float().cpu().numpy()
+        return Speech(audio, self.sampling_rate)
+
+    def synthesize_batch(self, texts):
+        import torch
+
+        with stage("tokenize"):
+            inputs = self.tokenizer(texts, return_tensors="pt", padding=True).to(self.device)
+        with torch.no_grad():
+            output = self.model(**inputs)
+        # Knip elke golfvorm terug tot zijn echte lengte
+        with stage("to_numpy"):
+            waveform = output.waveform.float().cpu().numpy()
+        return [
+            Speech(waveform[i, : int(length)], self.sampling_rate)
+            for i, length in enumerate(output.sequence_lengths)
+        ]
+
+    def unload(self):
+        del self.model, self.tokenizer
+        super().unload()
+
+
+@register_backend
+class TrainingTtsBackend(_WaveformBackend):
+    name = "training_tts_nl_v2"
+    model_id = "procit008/training_tts_nl_v2"
+
+    def model_class(self):
+        from transformers import AutoModelForTextToWaveform
+
+        return AutoModelForTextToWaveform
+
+
+@register_backend
+class MmsBackend(_WaveformBackend):
+    name = "mms-tts-nld"
+    model_id = "facebook/mms-tts-nld"
+
+    def model_class(self):
+        from transformers import VitsModel
+
+        return VitsModel
+
+
+@register_backend
+class OpenAIBackend(Backend):
+    """De cloudreferentie uit media/5.py.
+
+    Leest ``OPENAI_API_KEY`` en ``OPENAI_BASE_URL`` uit de omgeving; met de base-URL van
+    ``tts.openai_stub`` draait deze backend volledig lokaal.
+    """
+
+    name = "OpenAI-TTS-1-hd"
+    model_id = "tts-1-hd"
+
+    # OpenAI levert WAV-audio op 24 kHz
+    sampling_rate = 24000
+
+    def load(self):
+        from openai import OpenAI
+
+        self.client = OpenAI()
+        self.loaded = True
+
+    def synthesize(self, text, voice="alloy"):
+        import io
+
+        import soundfile as sf
+
+        with stage("request"):
+            response = self.client.audio.speech.create(
+                model=self.model_id, voice=voice, input=text, response_format="wav"
+            )
+        with stage("to_numpy"):
+            audio, sampling_rate = sf.read(io.BytesIO(response.content), dtype="float32")
+        return Speech(audio, sampling_rate)
+
+    def unload(self):
+        self.client.close()
+        del self.client
+        super().unload()
@@ -0,0 +1,12 @@
+# Lengte-buckets voor gebatchte synthese.
+#
+# Teksten van vergelijkbare lengte worden samen in één forward/generate-aanroep verwerkt, zodat er
+# zo min mogelijk rekenwerk aan padding verloren gaat.
+
+
+def length_buckets(texts: list[str], batch_size: int, key=len) -> list[list[int]]:
+    """Verdeel de indices van ``texts`` in batches van hoogstens ``batch_size`` met vergelijkbare lengte."""
+    if batch_size < 1:
+        raise ValueError("batch_size moet minstens 1 zijn")
+    order = sorted(range(len(texts)), key=lambda i: key(texts[i]))
+    return [order[start:start + batch_size] for start in range(0, len(order), batch_size)]
@@ -0,0 +1,214 @@
+# Inhoud-geadresseerde schijfcache voor gegenereerde spraak.
+#
+# Vaste zinnen (menu-items, meldingen) worden steeds opnieuw gegenereerd. De cache bewaart elk
+# fragment als FLAC onder de SHA-256 van alles wat de uitvoer bepaalt: model-id, modelrevisie,
+# tekst, stem (beschrijving of spreker-embedding), inferentieprecisie en backendopties (zoals de
+# snelle modus van Parler). De samplefrequentie volgt uit model en revisie en zit dus al in de
+# sleutel. Schrijven gebeurt atomair (tijdelijk bestand + os.replace), zodat meerdere workers
+# dezelfde map veilig kunnen delen. Bij een overschrijding van het bytebudget verdwijnen de minst
+# recent gebruikte bestanden (mtime). Elke worker telt alleen zijn eigen schrijfacties bij; daarom
+# wordt de map opnieuw doorlopen zodra die telling het budget nadert of een minuut oud is.
+#
+#     engine = Engine(cache=SynthesisCache("/var/cache/tts", max_bytes=512 * 1024**2))
+#     engine.synthesize("Uw bestelling is onderweg.")
+#     print(engine.cache.stats)  # CacheStats(hits=..., misses=..., evictions=...)
+
+import contextlib
+import hashlib
+import io
+import json
+import os
+import tempfile
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+
+import numpy as np
+
+from .backends import Speech
+
+DEFAULT_DIR = Path(os.environ.get("TTS_CACHE_DIR", Path.home() / ".cache" / "tts-nl"))
+# Standaardbudget: 1 GiB, te overschrijven via de omgevingsvariabele TTS_CACHE_MAX_BYTES
+DEFAULT_MAX_BYTES = int(os.environ.get("TTS_CACHE_MAX_BYTES", 1024**3))
+# Maximale leeftijd in seconden van de geschatte mapgrootte voordat de map opnieuw wordt doorlopen
+RESCAN_INTERVAL = 60.0
+# Opnieuw doorlopen boven deze fractie van het budget; verdringen tot onder de lagere fractie, zodat
+# een volle cache niet bij elke schrijfactie de hele map doorloopt
+_RESCAN_FRACTION = 0.9
+_EVICT_FRACTION = 0.8
+
+_SUFFIX = ".flac"
+
+
+@contextlib.contextmanager
+def atomic_write(path: str | Path):
+    """Open een tijdelijk bestand naast ``path`` om binair te schrijven; bij succes vervangt het ``path``.
+
+    Een gelijktijdige lezer ziet óf het oude, óf het volledige nieuwe bestand; bij een fout blijft er
+    geen tijdelijk bestand achter. De map van ``path`` moet al bestaan.
+    """
+    path = Path(path)
+    # Tijdelijk bestand in dezelfde map, zodat os.replace atomair is
+    fd, tmp = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            yield f
+        os.replace(tmp, path)
+    except BaseException:
+        with contextlib.suppress(FileNotFoundError):
+            os.unlink(tmp)
+        raise
+
+
+def _normalize(value):
+    """Maak een stemparameter JSON-serialiseerbaar; tensors en arrays worden vervangen door hun hash."""
+    if hasattr(value, "detach"):
+        value = value.detach().cpu().numpy()
+    if isinstance(value, np.ndarray):
+        array = np.ascontiguousarray(value)
+        digest = hashlib.sha256(array.tobytes())
+        digest.update(f"{array.dtype}{array.shape}".encode())
+        return f"sha256:{digest.hexdigest()}"
+    return value
+
+
+def cache_key(
+    model_id: str,
+    revision: str,
+    text: str,
+    voice: dict,
+    precision: str = "fp32",
+    options: dict | None = None,
+) -> str:
+    """SHA-256 over alle invoer die de gegenereerde audio bepaalt.
+
+    ``options`` zijn de extra constructorargumenten van de backend, zoals ``{"compile": True}``.
+    """
+    payload = {
+        "model": model_id,
+        "revision": revision,
+        "text": text,
+        "voice": {name: _normalize(value) for name, value in sorted(voice.items())},
+        "precision": precision,
+    }
+    # Zonder opties blijft de sleutel gelijk aan die van eerdere versies, zodat bestaande caches geldig blijven
+    if options:
+        payload["options"] = {name: _normalize(value) for name, value in sorted(options.items())}
+    return hashlib.sha256(json.dumps(payload, sort_keys=True, ensure_ascii=False).encode()).hexdigest()
+
+
+@dataclass
+class CacheStats:
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+
+class SynthesisCache:
+    """Schijfcache met een bytebudget en LRU-verdringing op basis van bestandstijden."""
+
+    def __init__(self, root: str | Path = DEFAULT_DIR, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.root = Path(root)
+        self.root.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self.stats = CacheStats()
+        self._lock = threading.Lock()
+        # Schatting van de totale grootte: de laatste telling van de map plus de eigen schrijfacties
+        # sindsdien. Andere workers schrijven in dezelfde map, dus de schatting loopt achter.
+        self._bytes = sum(size for _, size, _ in self._entries())
+        self._scanned = time.monotonic()
+
+    def _path(self, key: str) -> Path:
+        return self.root / key[:2] / (key + _SUFFIX)
+
+    def get(self, key: str) -> Speech | None:
+        import soundfile as sf
+
+        path = self._path(key)
+        try:
+            data = path.read_bytes()
+        except FileNotFoundError:
+            with self._lock:
+                self.stats.misses += 1
+            return None
+        # Markeer als recent gebruikt voor de LRU-verdringing
+        with contextlib.suppress(FileNotFoundError):
+            os.utime(path)
+        audio, sampling_rate = sf.read(io.BytesIO(data), dtype="float32")
+        with self._lock:
+            self.stats.hits += 1
+        return Speech(audio, sampling_rate)
+
+    def put(self, key: str, speech: Speech) -> None:
+        import soundfile as sf
+
+        path = self._path(key)
+        path.parent.mkdir(exist_ok=True)
+        buffer = io.BytesIO()
+        sf.write(buffer, speech.audio, speech.sampling_rate, format="FLAC", subtype="PCM_24")
+        data = buffer.getvalue()
+
+        # Atomair schrijven: een andere worker ziet óf het oude, óf het volledige nieuwe bestand
+        with atomic_write(path) as f:
+            f.write(data)
+
+        with self._lock:
+            self._bytes += len(data)
+            stale = time.monotonic() - self._scanned > RESCAN_INTERVAL
+            if stale or self._bytes > self.max_bytes * _RESCAN_FRACTION:
+                self._rescan()
+
+    def _entries(self):
+        for shard in os.scandir(self.root):
+            if not shard.is_dir():
+                continue
+            for entry in os.scandir(shard.path):
+                if entry.name.endswith(_SUFFIX):
+                    try:
+                        stat = entry.stat()
+                    except FileNotFoundError:
+                        continue
+                    yield entry.path, stat.st_size, stat.st_mtime
+
+    def _rescan(self) -> None:
+        # Echte grootte van de map, inclusief wat andere workers schreven; verdring pas boven het budget
+        entries = list(self._entries())
+        self._bytes = sum(size for _, size, _ in entries)
+        self._scanned = time.monotonic()
+        if self._bytes > self.max_bytes:
+            self._evict(entries)
+
+    def _evict(self, entries) -> None:
+        entries = sorted(entries, key=lambda entry: entry[2])
+        total = sum(size for _, size, _ in entries)
+        for path, size, _ in entries:
+            if total <= self.max_bytes * _EVICT_FRACTION:
+                break
+            try:
+                os.unlink(path)
+                self.stats.evictions += 1
+            except FileNotFoundError:
+                pass  # Al verwijderd door een andere worker
+            total -= size
+        self._bytes = total
+
+    def clear(self) -> None:
+        with self._lock:
+            for path, _, _ in list(self._entries()):
+                with contextlib.suppress(FileNotFoundError):
+                    os.unlink(path)
+            self._bytes = 0
+
+    @property
+    def nbytes(self) -> int:
+        return self._bytes
+
+    def __len__(self):
+        return sum(1 for _ in self._entries())
+
@@ -0,0 +1,132 @@
+# Centrale ingang voor spraaksynthese: één API voor alle geregistreerde backends.
+#
+#     from tts import synthesize
+#     speech = synthesize("Goedemorgen!", model="mms-tts-nld")
+#     speech.write("goedemorgen.wav")
+
+import os
+import threading
+from collections.abc import Iterator
+
+from .backends import BACKENDS, Speech
+from .batching import length_buckets
+from .cache import SynthesisCache, cache_key
+from .pool import ModelPool
+from .streaming import pcm16, split_sentences
+
+DEFAULT_MODEL = "mms-tts-nld"
+
+
+class Engine:
+    """Spraaksynthese over een gedeelde pool van geladen modellen, optioneel met een schijfcache."""
+
+    def __init__(
+        self,
+        pool: ModelPool | None = None,
+        default_model: str = DEFAULT_MODEL,
+        cache: SynthesisCache | None = None,
+    ):
+        self.pool = pool if pool is not None else ModelPool()
+        self.default_model = default_model
+        self.cache = cache
+
+    def _key(self, model: str, text: str, voice: dict) -> str:
+        if model not in BACKENDS:
+            raise KeyError(f"Onbekend model {model!r}; kies uit: {', '.join(BACKENDS)}")
+        backend = BACKENDS[model]
+        return cache_key(
+            backend.model_id,
+            self.pool.revision(model),
+            text,
+            backend.voice_key(voice),
+            precision=self.pool.precision(model),
+            # De snelle modus van Parler vult prompts op en decodeert anders; die audio hoort niet bij eager
+            options=self.pool.options.get(model),
+        )
+
+    def synthesize(self, text: str, model: str | None = None, **voice) -> Speech:
+        """Zet ``text`` om naar spraak met ``model``; ``voice`` gaat door naar de backend."""
+        model = model or self.default_model
+        if self.cache is None:
+            return self.pool.get(model).synthesize(text, **voice)
+
+        # Bij een cachetreffer wordt het model niet eens geladen
+        key = self._key(model, text, voice)
+        speech = self.cache.get(key)
+        if speech is None:
+            speech = self.pool.get(model).synthesize(text, **voice)
+            self.cache.put(key, speech)
+        return speech
+
+    def synthesize_batch(
+        self, texts: list[str], model: str | None = None, batch_size: int = 8, **voice
+    ) -> list[Speech]:
+        """Zet een lijst teksten om naar spraak in lengte-buckets; de volgorde blijft behouden."""
+        model = model or self.default_model
+        results = [None] * len(texts)
+        keys = {}
+        if self.cache is not None:
+            for i, text in enumerate(texts):
+                keys[i] = self._key(model, text, voice)
+                results[i] = self.cache.get(keys[i])
+
+        # Alleen de teksten die niet in de cache stonden gaan door het model
+        missing = [i for i, speech in enumerate(results) if speech is None]
+        if not missing:
+            return results
+        backend = self.pool.get(model)
+        for bucket in length_buckets([texts[i] for i in missing], batch_size):
+            indices = [missing[j] for j in bucket]
+            speeches = backend.synthesize_batch([texts[i] for i in indices], **voice)
+            for i, speech in zip(indices, speeches):
+                results[i] = speech
+                if self.cache is not None:
+                    self.cache.put(keys[i], speech)
+        return results
+
+    def stream(
+        self, text: str, model: str | None = None, max_chars: int = 120, **voice
+    ) -> Iterator[tuple[str, Speech]]:
+        """Genereer ``text`` zin voor zin; geef ``(tekst, spraak)`` per fragment zodra het klaar is."""
+        for chunk in split_sentences(text, max_chars=max_chars):
+            yield chunk, self.synthesize(chunk, model=model, **voice)
+
+    def stream_pcm(
+        self, text: str, model: str | None = None, max_chars: int = 120, **voice
+    ) -> Iterator[tuple[str, bytes, int]]:
+        """Als ``stream``, maar als ``(tekst, 16-bit PCM, samplefrequentie)`` voor een audio-uitgang of socket."""
+        for chunk, speech in self.stream(text, model=model, max_chars=max_chars, **voice):
+            yield chunk, pcm16(speech.audio), speech.sampling_rate
+
+
+_default_engine = None
+_default_lock = threading.Lock()
+
+
+def get_engine() -> Engine:
+    """De gedeelde engine van dit proces, aangemaakt bij het eerste gebruik."""
+    global _default_engine
+    with _default_lock:
+        if _default_engine is None:
+            # De schijfcache staat aan zodra TTS_CACHE_DIR gezet is
+            cache = SynthesisCache() if "TTS_CACHE_DIR" in os.environ else None
+            _default_engine = Engine(cache=cache)
+        return _default_engine
+
+
+def synthesize(text: str, model: str | None = None, **voice) -> Speech:
+    return get_engine().synthesize(text, model=model, **voice)
+
+
+def synthesize_batch(texts: list[str], model: str | None = None, batch_size: int = 8, **voice) -> list[Speech]:
+    return get_engine().synthesize_batch(texts, model=model, batch_size=batch_size, **voice)
+
+
+def stream(text: str, model: str | None = None, max_chars: int = 120, **voice) -> Iterator[tuple[str, Speech]]:
+    return get_engine().stream(text, model=model, max_chars=max_chars, **voice)
+
+
+def stream_pcm(
+    text: str, model: str | None = None, max_chars: int = 120, **voice
+) -> Iterator[tuple[str, bytes, int]]:
+    return get_engine().stream_pcm(text, model=model, max_chars=max_chars, **voice)
@@ -0,0 +1,146 @@
+# Aggregatie van ruwe MOS-beoordelingen (Mean Opinion Score) per beoordelaar.
+#
+# Invoer is een CSV- of Parquet-bestand met één rij per beoordeling, in lang formaat:
+#
+#     rater,model,criterion,score
+#     r01,mms-tts-nld,Natuurlijkheid,4
+#
+# of in breed formaat met één kolom per criterium (rater, model, Natuurlijkheid, ...).
+#
+# Alle scores staan in één array [model, criterium, beoordelaar] met NaN voor ontbrekende scores.
+# Gemiddelden, bootstrap-betrouwbaarheidsintervallen en rangstabiliteit worden volledig
+# gevectoriseerd berekend: een bootstrap-steekproef van beoordelaars is een vector met
+# multinomiale gewichten, zodat alle steekproeven samen één matrixvermenigvuldiging zijn.
+
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+# De criteria uit de enquête in app.py, in vaste volgorde
+CRITERIA = ["Natuurlijkheid", "Verstaanbaarheid", "Audio-kwaliteit", "Stememotie", "Algemene tevredenheid"]
+
+
+def load_ratings(path: str | Path) -> pd.DataFrame:
+    """Lees beoordelingen uit CSV of Parquet en geef ze terug in lang formaat."""
+    path = Path(path)
+    ratings = pd.read_parquet(path) if path.suffix == ".parquet" else pd.read_csv(path)
+    if "criterion" not in ratings.columns:
+        ratings = ratings.melt(id_vars=["rater", "model"], var_name="criterion", value_name="score")
+    return ratings[["rater", "model", "criterion", "score"]].dropna(subset=["score"])
+
+
+class MosAggregator:
+    """Houdt alle scores bij en berekent gemiddelden, intervallen en rangstabiliteit.
+
+    Nieuwe beoordelingen worden met ``update`` toegevoegd; alleen de nieuwe rijen worden
+    verwerkt. Een latere score van dezelfde beoordelaar voor hetzelfde model en criterium
+    vervangt de eerdere.
+    """
+
+    def __init__(self, criteria: list[str] | None = None):
+        self.criteria = list(criteria or CRITERIA)
+        self.models: list[str] = []
+        self.raters: list[str] = []
+        self._model_index: dict[str, int] = {}
+        self._rater_index: dict[str, int] = {}
+        self.scores = np.full((0, len(self.criteria), 0), np.nan)
+        # Laatste bootstrap en de (n, seed) waarmee die getrokken is
+        self._bootstrap = None
+        self._bootstrap_key = None
+
+    @classmethod
+    def from_file(cls, path: str | Path, criteria: list[str] | None = None) -> "MosAggregator":
+        aggregator = cls(criteria)
+        aggregator.update(load_ratings(path))
+        return aggregator
+
+    def _codes(self, values: pd.Series, names: list[str], index: dict[str, int]) -> np.ndarray:
+        # Nieuwe namen krijgen het volgende vrije nummer; de bestaande nummering blijft gelijk
+        for name in pd.unique(values):
+            if name not in index:
+                index[name] = len(names)
+                names.append(name)
+        return values.map(index).to_numpy()
+
+    def update(self, ratings: pd.DataFrame) -> None:
+        """Voeg beoordelingen (lang formaat) toe."""
+        unknown = set(ratings["criterion"]) - set(self.criteria)
+        if unknown:
+            raise ValueError(f"Onbekende criteria: {', '.join(sorted(unknown))}")
+        models = self._codes(ratings["model"], self.models, self._model_index)
+        raters = self._codes(ratings["rater"].astype(str), self.raters, self._rater_index)
+        criteria = ratings["criterion"].map({c: i for i, c in enumerate(self.criteria)}).to_numpy()
+
+        # Array vergroten voor nieuwe modellen en beoordelaars
+        grow_models = len(self.models) - self.scores.shape[0]
+        grow_raters = len(self.raters) - self.scores.shape[2]
+        if grow_models or grow_raters:
+            self.scores = np.pad(
+                self.scores, ((0, grow_models), (0, 0), (0, grow_raters)), constant_values=np.nan
+            )
+        self.scores[models, criteria, raters] = ratings["score"].to_numpy(dtype=float)
+        self._bootstrap = None
+
+    def means(self) -> pd.DataFrame:
+        """Gemiddelde score per model (rijen) en criterium (kolommen)."""
+        with np.errstate(invalid="ignore"):
+            means = np.nanmean(self.scores, axis=2)
+        return pd.DataFrame(means, index=pd.Index(self.models, name="Model"), columns=self.criteria)
+
+    def bootstrap(self, n: int = 2000, seed: int = 0) -> np.ndarray:
+        """Gemiddelden voor ``n`` bootstrap-steekproeven van beoordelaars: array [model, criterium, n]."""
+        if self._bootstrap is not None and self._bootstrap_key == (n, seed):
+            return self._bootstrap
+        n_models, n_criteria, n_raters = self.scores.shape
+        rng = np.random.default_rng(seed)
+        # Elke rij: hoe vaak elke beoordelaar in die steekproef getrokken is
+        weights = rng.multinomial(n_raters, np.full(n_raters, 1 / n_raters), size=n).astype(float)
+
+        rated = ~np.isnan(self.scores)
+        flat_scores = np.where(rated, self.scores, 0.0).reshape(-1, n_raters)
+        flat_counts = rated.reshape(-1, n_raters).astype(float)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            means = (flat_scores @ weights.T) / (flat_counts @ weights.T)
+        self._bootstrap = means.reshape(n_models, n_criteria, n)
+        self._bootstrap_key = (n, seed)
+        return self._bootstrap
+
+    def confidence_intervals(self, level: float = 0.95, n: int = 2000, seed: int = 0):
+        """Onder- en bovengrens van het ``level``-betrouwbaarheidsinterval per model en criterium."""
+        tail = (1 - level) / 2 * 100
+        low, high = np.nanpercentile(self.bootstrap(n, seed), [tail, 100 - tail], axis=2)
+        index = pd.Index(self.models, name="Model")
+        return (
+            pd.DataFrame(low, index=index, columns=self.criteria),
+            pd.DataFrame(high, index=index, columns=self.criteria),
+        )
+
+    def rank_stability(self, n: int = 2000, seed: int = 0) -> pd.DataFrame:
+        """Kans dat elk model op elke plaats eindigt, op basis van het gemiddelde over alle criteria."""
+        with np.errstate(invalid="ignore"):
+            overall = np.nanmean(self.bootstrap(n, seed), axis=1)  # [model, n]
+        # Plaats 0 = hoogste gemiddelde; NaN (geen scores in de steekproef) komt achteraan
+        ranks = np.argsort(np.argsort(-np.nan_to_num(overall, nan=-np.inf), axis=0), axis=0)
+        places = np.arange(len(self.models))
+        probabilities = (ranks[:, :, None] == places).mean(axis=1)
+        return pd.DataFrame(
+            probabilities, index=pd.Index(self.models, name="Model"), columns=places + 1
+        )
+
+    def ranking(self, level: float = 0.95, n: int = 2000, seed: int = 0) -> pd.DataFrame:
+        """Modellen gesorteerd op gemiddelde score, met interval en kans op de eerste plaats."""
+        with np.errstate(invalid="ignore"):
+            overall = np.nanmean(self.bootstrap(n, seed), axis=1)
+        tail = (1 - level) / 2 * 100
+        low, high = np.nanpercentile(overall, [tail, 100 - tail], axis=1)
+        ranking = pd.DataFrame(
+            {
+                "Gemiddelde": self.means().mean(axis=1).to_numpy(),
+                "Ondergrens": low,
+                "Bovengrens": high,
+                "Kans op plaats 1": self.rank_stability(n, seed)[1].to_numpy(),
+            },
+            index=pd.Index(self.models, name="Model"),
+        )
+        return ranking.sort_values("Gemiddelde", ascending=False)
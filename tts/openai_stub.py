@@ -0,0 +1,104 @@
+# Lokale stand-in voor het OpenAI ``/v1/audio/speech``-endpoint.
+#
+# Hiermee kunnen metingen en tests de cloudreferentie (media/5.py) nabootsen zonder API-sleutel,
+# netwerk of kosten. De server geeft een sinustoon terug waarvan de duur meegroeit met de tekst,
+# optioneel na een kunstmatige vertraging om netwerklatentie te simuleren.
+#
+#     python -m tts.openai_stub --port 8000 --latency 0.2
+#     OPENAI_BASE_URL=http://127.0.0.1:8000/v1 OPENAI_API_KEY=stub python media/5.py
+
+import argparse
+import contextlib
+import io
+import json
+import threading
+import time
+import wave
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import numpy as np
+
+SAMPLING_RATE = 24000
+# Ongeveer 15 tekens per seconde spraak
+CHARS_PER_SECOND = 15
+
+
+def fake_speech(text: str, sampling_rate: int = SAMPLING_RATE) -> bytes:
+    """Een WAV-bestand met een zachte sinustoon zo lang als ``text`` ongeveer zou duren."""
+    n_samples = max(1, int(len(text) / CHARS_PER_SECOND * sampling_rate))
+    t = np.arange(n_samples) / sampling_rate
+    samples = (0.1 * np.sin(2 * np.pi * 220 * t) * 32767).astype("<i2")
+    buffer = io.BytesIO()
+    with wave.open(buffer, "wb") as f:
+        f.setnchannels(1)
+        f.setsampwidth(2)
+        f.setframerate(sampling_rate)
+        f.writeframes(samples.tobytes())
+    return buffer.getvalue()
+
+
+class _Handler(BaseHTTPRequestHandler):
+    latency = 0.0
+    chunk_size = 16 * 1024
+
+    def do_POST(self):
+        if self.path.rstrip("/") not in ("/v1/audio/speech", "/audio/speech"):
+            self.send_error(404)
+            return
+        body = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))) or b"{}")
+        if "input" not in body:
+            self.send_error(400, "Veld 'input' ontbreekt")
+            return
+        time.sleep(self.latency)
+        audio = fake_speech(body["input"])
+
+        # Chunked versturen, net als de echte API, zodat streamende clients getest kunnen worden
+        self.send_response(200)
+        self.send_header("Content-Type", "audio/wav")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+        try:
+            for start in range(0, len(audio), self.chunk_size):
+                chunk = audio[start:start + self.chunk_size]
+                self.wfile.write(f"{len(chunk):X}\r\n".encode() + chunk + b"\r\n")
+            self.wfile.write(b"0\r\n\r\n")
+        except (BrokenPipeError, ConnectionResetError):
+            pass  # Client heeft afgebroken, bijvoorbeeld na een time-out
+
+    def log_message(self, format, *args):
+        pass
+
+
+def make_server(host: str = "127.0.0.1", port: int = 0, latency: float = 0.0) -> ThreadingHTTPServer:
+    handler = type("Handler", (_Handler,), {"latency": latency, "protocol_version": "HTTP/1.1"})
+    return ThreadingHTTPServer((host, port), handler)
+
+
+@contextlib.contextmanager
+def serve(latency: float = 0.0):
+    """Start de stub op een vrije poort in een achtergrondthread en geef de base-URL terug."""
+    server = make_server(latency=latency)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        host, port = server.server_address[:2]
+        yield f"http://{host}:{port}/v1"
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--latency", type=float, default=0.0, help="kunstmatige vertraging per verzoek in seconden")
+    args = parser.parse_args(argv)
+
+    server = make_server(args.host, args.port, args.latency)
+    print(f"OpenAI-stub luistert op http://{args.host}:{args.port}/v1")
+    server.serve_forever()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+# Begrensde pool van geladen modellen met LRU-verdringing op basis van geheugengebruik.
+#
+# Het laden van een model kost seconden (schijf-I/O plus initialisatie van de gewichten). Een
+# langlopend proces houdt daarom de recent gebruikte modellen in het geheugen en gooit pas het
+# minst recent gebruikte model weg als de totale voetafdruk boven het budget uitkomt.
+
+import os
+import threading
+from collections import OrderedDict
+
+from .backends import BACKENDS, Backend
+
+# Standaardbudget: 6 GiB, te overschrijven via de omgevingsvariabele TTS_POOL_MAX_BYTES
+DEFAULT_MAX_BYTES = int(os.environ.get("TTS_POOL_MAX_BYTES", 6 * 1024**3))
+
+
+class ModelPool:
+    """Houdt geladen backends vast en verdringt de minst recent gebruikte bij geheugentekort."""
+
+    def __init__(
+        self,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+        device: str = "cpu",
+        revisions: dict | None = None,
+        precisions: dict | None = None,
+        options: dict | None = None,
+    ):
+        self.max_bytes = max_bytes
+        self.device = device
+        # Vastgepinde modelrevisies per naam; standaard "main"
+        self.revisions = dict(revisions or {})
+        # Inferentieprecisie per naam (zie tts.quantize); standaard "fp32"
+        self.precisions = dict(precisions or {})
+        # Extra constructorargumenten per naam, zoals {"parler-tts-...": {"compile": True}}
+        self.options = dict(options or {})
+        self._models: OrderedDict[str, Backend] = OrderedDict()
+        self._sizes: dict[str, int] = {}
+        self._lock = threading.RLock()
+        # Eén lock per modelnaam, vastgehouden tijdens het laden
+        self._loading: dict[str, threading.Lock] = {}
+        self.loads = 0
+        self.evictions = 0
+
+    def get(self, name: str) -> Backend:
+        """Geef de geladen backend ``name``; laad hem als hij nog niet in de pool zit."""
+        with self._lock:
+            backend = self._models.get(name)
+            if backend is not None:
+                self._models.move_to_end(name)
+                return backend
+            if name not in BACKENDS:
+                raise KeyError(f"Onbekend model {name!r}; kies uit: {', '.join(BACKENDS)}")
+            loading = self._loading.setdefault(name, threading.Lock())
+
+        # Laden gebeurt buiten de poollock: verschillende modellen laden tegelijk, terwijl gelijktijdige
+        # aanvragen voor hetzelfde model op één lading wachten
+        with loading:
+            with self._lock:
+                backend = self._models.get(name)
+                if backend is not None:
+                    self._models.move_to_end(name)
+                    return backend
+            backend = BACKENDS[name](
+                device=self.device,
+                revision=self.revision(name),
+                precision=self.precision(name),
+                **self.options.get(name, {}),
+            )
+            backend.load()
+            with self._lock:
+                self.loads += 1
+                self._models[name] = backend
+                self._sizes[name] = backend.nbytes()
+                self._shrink(keep=name)
+            return backend
+
+    def revision(self, name: str) -> str:
+        return self.revisions.get(name, "main")
+
+    def precision(self, name: str) -> str:
+        return self.precisions.get(name, "fp32")
+
+    def _shrink(self, keep: str) -> None:
+        # Het zojuist opgevraagde model blijft altijd staan, ook als het alleen al te groot is
+        while self.nbytes > self.max_bytes and len(self._models) > 1:
+            oldest = next(iter(self._models))
+            if oldest == keep:
+                break
+            self.evict(oldest)
+
+    def evict(self, name: str) -> None:
+        # Alleen de verwijzing van de pool verdwijnt: een thread die de backend nog gebruikt houdt hem
+        # zelf vast, en de gewichten komen vrij zodra de laatste verwijzing weg is. ``unload`` zou het
+        # model onder zo'n lopende synthese vandaan trekken.
+        with self._lock:
+            if self._models.pop(name, None) is None:
+                return
+            del self._sizes[name]
+            self.evictions += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            for name in list(self._models):
+                self.evict(name)
+
+    @property
+    def nbytes(self) -> int:
+        return sum(self._sizes.values())
+
+    def __contains__(self, name):
+        return name in self._models
+
+    def __len__(self):
+        return len(self._models)
+
+    def __repr__(self):
+        return f"ModelPool({list(self._models)}, {self.nbytes / 1024**2:.0f} MiB / {self.max_bytes / 1024**2:.0f} MiB)"
@@ -0,0 +1,137 @@
+# Vaste sprekerpresets voor Parler-TTS en een cache van hun gecodeerde beschrijvingen.
+#
+# Parler stuurt de stem met een tekstbeschrijving. Zonder cache gaat die beschrijving bij elke
+# uiting opnieuw door de description-tokenizer en de tekst-encoder, terwijl er in de praktijk maar
+# een handvol vaste presets is. ``DescriptionCache`` codeert elke beschrijving één keer en bewaart
+# de verborgen toestanden van de encoder plus de attention mask; ParlerBackend geeft die direct als
+# ``encoder_outputs`` aan ``generate``.
+#
+# De cache is begrensd (LRU op aantal beschrijvingen) en kan optioneel naar schijf schrijven, zodat
+# ook een nieuw proces de encoder niet hoeft te draaien. Per beschrijving wordt bijgehouden hoe lang
+# het coderen duurde; elke treffer telt die tijd op bij ``stats.saved_seconds``.
+#
+#     speech = synthesize("Goedemorgen!", model="parler-tts-mini-multilingual-v1.1", preset="mark")
+
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+
+from .backends import PARLER_DESCRIPTION
+from .cache import CacheStats, atomic_write
+
+# Presets op naam; uit te breiden met register_preset
+PRESETS: dict[str, str] = {
+    "mark": PARLER_DESCRIPTION,
+    "neutraal": (
+        "Een heldere, neutrale stem met een gemiddelde snelheid en toonhoogte. "
+        "De opname is van zeer hoge kwaliteit, zonder achtergrondgeluid."
+    ),
+}
+
+
+def register_preset(name: str, description: str) -> None:
+    PRESETS[name] = description
+
+
+def resolve(preset: str | None, description: str | None) -> str:
+    """De beschrijving voor ``preset``, of ``description`` zelf; zonder beide de standaardstem."""
+    if preset is not None:
+        if preset not in PRESETS:
+            raise KeyError(f"Onbekende preset {preset!r}; kies uit: {', '.join(PRESETS)}")
+        return PRESETS[preset]
+    return description if description is not None else PARLER_DESCRIPTION
+
+
+def description_key(model_id: str, revision: str, description: str) -> str:
+    return hashlib.sha256(f"{model_id}\0{revision}\0{description}".encode()).hexdigest()
+
+
+@dataclass
+class EncodingStats(CacheStats):
+    # Encodertijd die dankzij treffers niet opnieuw besteed is
+    saved_seconds: float = 0.0
+    disk_hits: int = 0
+
+
+class DescriptionCache:
+    """LRU-cache van gecodeerde beschrijvingen: (verborgen toestanden, attention mask) per sleutel."""
+
+    def __init__(self, max_entries: int = 32, root: str | Path | None = None):
+        self.max_entries = max_entries
+        self.root = Path(root) if root is not None else None
+        self.stats = EncodingStats()
+        # Per sleutel (gecodeerde beschrijving, gemeten encodertijd); de tijd telt mee in saved_seconds
+        self._entries: OrderedDict[str, tuple[tuple, float]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str, encode):
+        """Gecodeerde beschrijving voor ``key``; bij een misser wordt ``encode()`` aangeroepen."""
+        with self._lock:
+            cached = self._entries.get(key)
+            if cached is not None:
+                self._entries.move_to_end(key)
+                entry, cost = cached
+                self.stats.hits += 1
+                self.stats.saved_seconds += cost
+                return entry
+
+        loaded = self._load(key)
+        if loaded is not None:
+            entry, cost = loaded
+            with self._lock:
+                self.stats.hits += 1
+                self.stats.disk_hits += 1
+                self.stats.saved_seconds += cost
+        else:
+            start = time.perf_counter()
+            entry = encode()
+            cost = time.perf_counter() - start
+            with self._lock:
+                self.stats.misses += 1
+            self._save(key, entry, cost)
+        self._insert(key, entry, cost)
+        return entry
+
+    def _insert(self, key, entry, cost: float):
+        with self._lock:
+            self._entries[key] = entry, cost
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.stats.evictions += 1
+
+    def _path(self, key: str) -> Path:
+        return self.root / f"{key}.pt"
+
+    def _load(self, key: str):
+        if self.root is None:
+            return None
+        import torch
+
+        try:
+            data = torch.load(self._path(key), weights_only=True)
+        except FileNotFoundError:
+            return None
+        return (data["hidden_states"], data["attention_mask"]), data["seconds"]
+
+    def _save(self, key: str, entry, cost: float) -> None:
+        if self.root is None:
+            return
+        import torch
+
+        hidden_states, attention_mask = entry
+        self.root.mkdir(parents=True, exist_ok=True)
+        with atomic_write(self._path(key)) as f:
+            torch.save(
+                {"hidden_states": hidden_states.cpu(), "attention_mask": attention_mask.cpu(), "seconds": cost}, f
+            )
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
@@ -0,0 +1,182 @@
+# Per-fase profilering van een synthese: waar gaat de tijd naartoe?
+#
+# Een aanroep van ``synthesize`` bestaat uit fasen: tokenisatie, tekst-encoder, decoder (bij Parler
+# de generate-lus), vocoder, omzetting naar numpy en het wegschrijven. De backends markeren die
+# fasen met ``stage``; zolang er geen ``profile`` actief is kost dat vrijwel niets.
+#
+#     with profile() as p:
+#         speech = synthesize("Goedemorgen!", model="mms-tts-nld")
+#         speech.write("goedemorgen.wav")
+#     print(p.table())
+#
+#     with profile(trace="trace.json"):   # plus een Chrome-trace (chrome://tracing, Perfetto)
+#         ...
+#
+# Per fase worden wandtijd, CPU-tijd (alle threads van het proces) en de groei van het residente
+# geheugen bijgehouden. Fasen mogen genest zijn; een fase telt alleen zijn eigen tijd, zonder die
+# van geneste fasen, zodat de fasen samen optellen tot het totaal. Wat buiten alle fasen valt
+# komt in "overig".
+
+import contextlib
+import functools
+import os
+import time
+from contextvars import ContextVar
+from dataclasses import dataclass
+
+# Vaste volgorde voor tabellen en grafieken
+STAGES = ("tokenize", "encoder", "duration", "decoder", "vocoder", "request", "to_numpy", "write", "overig")
+
+_active: ContextVar["Profile | None"] = ContextVar("tts_profile", default=None)
+
+
+def current_rss() -> int:
+    """Huidig residentgeheugen van het proces in bytes."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (FileNotFoundError, ValueError):
+        import resource  # Geen /proc (macOS): piek-RSS is het beste wat er is
+
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+
+@dataclass
+class StageTiming:
+    wall: float = 0.0
+    cpu: float = 0.0
+    memory: int = 0
+    calls: int = 0
+
+
+class Profile:
+    """Verzamelt de tijden per fase binnen één ``profile``-blok."""
+
+    def __init__(self, tracing: bool = False):
+        self.stages: dict[str, StageTiming] = {}
+        self.tracing = tracing
+        self.wall = self.cpu = 0.0
+        self._stack = []
+
+    def _enter(self, name):
+        record = None
+        if self.tracing:
+            # Dezelfde fase ook als blok in de Chrome-trace
+            from torch.profiler import record_function
+
+            record = record_function(name)
+            record.__enter__()
+        self._stack.append([name, time.perf_counter(), time.process_time(), current_rss(), 0.0, 0.0, 0, record])
+
+    def _exit(self):
+        name, wall, cpu, rss, child_wall, child_cpu, child_memory, record = self._stack.pop()
+        if record is not None:
+            record.__exit__(None, None, None)
+        wall = time.perf_counter() - wall
+        cpu = time.process_time() - cpu
+        memory = current_rss() - rss
+        timing = self.stages.setdefault(name, StageTiming())
+        timing.wall += wall - child_wall
+        timing.cpu += cpu - child_cpu
+        timing.memory += memory - child_memory
+        timing.calls += 1
+        if self._stack:
+            # De omringende fase telt deze tijd niet nog een keer
+            parent = self._stack[-1]
+            parent[4] += wall
+            parent[5] += cpu
+            parent[6] += memory
+
+    def breakdown(self) -> dict[str, dict]:
+        """Tijden per fase in vaste volgorde, in ms en MB, inclusief "overig"."""
+        stages = dict(self.stages)
+        rest = StageTiming(
+            self.wall - sum(t.wall for t in stages.values()),
+            self.cpu - sum(t.cpu for t in stages.values()),
+        )
+        if rest.wall > 0:
+            stages["overig"] = rest
+        order = sorted(stages, key=lambda name: STAGES.index(name) if name in STAGES else len(STAGES))
+        return {
+            name: {
+                "wall_ms": stages[name].wall * 1000,
+                "cpu_ms": stages[name].cpu * 1000,
+                "memory_mb": stages[name].memory / 1e6,
+                "calls": stages[name].calls,
+            }
+            for name in order
+        }
+
+    def table(self) -> str:
+        lines = [f"{'fase':<10} {'wand ms':>9} {'cpu ms':>9} {'geheugen MB':>12}"]
+        for name, timing in self.breakdown().items():
+            lines.append(f"{name:<10} {timing['wall_ms']:>9.1f} {timing['cpu_ms']:>9.1f} {timing['memory_mb']:>12.1f}")
+        lines.append(f"{'totaal':<10} {self.wall * 1000:>9.1f} {self.cpu * 1000:>9.1f}")
+        return "\n".join(lines)
+
+
+@contextlib.contextmanager
+def profile(trace: str | os.PathLike | None = None):
+    """Meet alle fasen binnen dit blok; met ``trace`` ook een Chrome-trace van de torch-profiler."""
+    profiler = None
+    if trace is not None:
+        from torch.profiler import ProfilerActivity
+        from torch.profiler import profile as torch_profile
+
+        profiler = torch_profile(activities=[ProfilerActivity.CPU], record_shapes=True)
+    result = Profile(tracing=profiler is not None)
+    # Het starten van de torch-profiler zelf telt niet mee
+    with profiler if profiler is not None else contextlib.nullcontext():
+        token = _active.set(result)
+        start_wall, start_cpu = time.perf_counter(), time.process_time()
+        try:
+            yield result
+        finally:
+            result.wall = time.perf_counter() - start_wall
+            result.cpu = time.process_time() - start_cpu
+            _active.reset(token)
+    if profiler is not None:
+        profiler.export_chrome_trace(os.fspath(trace))
+
+
+@contextlib.contextmanager
+def stage(name: str):
+    """Markeer een fase; ook bruikbaar als decorator (``@stage("vocoder")``)."""
+    current = _active.get()
+    if current is None:
+        yield
+        return
+    current._enter(name)
+    try:
+        yield
+    finally:
+        current._exit()
+
+
+def instrument(module, name: str) -> None:
+    """Markeer elke forward-aanroep van een torch-module als fase ``name``."""
+
+    def before(module, args):
+        current = _active.get()
+        if current is not None:
+            current._enter(name)
+
+    def after(module, args, output):
+        current = _active.get()
+        if current is not None and current._stack:
+            current._exit()
+
+    module.register_forward_pre_hook(before)
+    module.register_forward_hook(after)
+
+
+def instrument_method(obj, method: str, name: str) -> None:
+    """Markeer een methode van één object (geen module-forward, zoals ``decode``) als fase ``name``."""
+    function = getattr(obj, method)
+
+    @functools.wraps(function)
+    def wrapper(*args, **kwargs):
+        with stage(name):
+            return function(*args, **kwargs)
+
+    setattr(obj, method, wrapper)
@@ -0,0 +1,20 @@
+# Vaste Nederlandse testzinnen, zodat metingen tussen modellen en runs vergelijkbaar blijven.
+
+# De testzin uit de enquête in app.py
+PROMPT = (
+    "De snelle vos sprong behendig over de luie hond, terwijl de regen zachtjes tegen het raam tikte "
+    "en in de verte het onweer steeds luider begon te rommelen, alsof de natuur zelf een indrukwekkende "
+    "symfonie wilde spelen."
+)
+
+# Zinnen van oplopende lengte: korte meldingen tot de volledige enquêtezin
+PROMPTS = [
+    "Goedemorgen.",
+    "De trein vertrekt over vijf minuten.",
+    "Uw pakket wordt vandaag tussen twee en vier uur bezorgd.",
+    "Vergeet niet om morgenochtend de vuilnisbak aan de straat te zetten.",
+    "Het is vandaag overwegend bewolkt met in de middag kans op een enkele regenbui.",
+    "Neem bij de volgende rotonde de tweede afslag en volg de weg gedurende drie kilometer.",
+    "Welkom terug! U heeft drie nieuwe berichten en één gemiste oproep van een onbekend nummer.",
+    PROMPT,
+]
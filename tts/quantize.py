@@ -0,0 +1,69 @@
+# Opt-in gekwantiseerde inferentie voor de VITS-backends, plus de maten waarmee de kwaliteit
+# tegen de fp32-golfvorm wordt gecontroleerd.
+#
+# "int8" past dynamische INT8-kwantisatie toe op de lineaire lagen (gewichten INT8, activaties
+# per aanroep gekwantiseerd). PyTorch kent geen dynamische kwantisatie voor convoluties, dus de
+# HiFi-GAN-decoder van VITS blijft fp32. "bf16" zet het hele model om naar bfloat16, op de
+# voorspelde duren na.
+#
+#     pool = ModelPool(precisions={"mms-tts-nld": "int8"})
+
+import numpy as np
+
+PRECISIONS = ("fp32", "int8", "bf16")
+
+
+def quantize(model, precision: str):
+    """Geef ``model`` terug in de gevraagde precisie; ``fp32`` laat het model ongemoeid."""
+    import torch
+
+    if precision == "fp32":
+        return model
+    if precision == "int8":
+        return torch.ao.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
+    if precision == "bf16":
+        model = model.to(torch.bfloat16)
+        if hasattr(model, "duration_predictor"):
+            # VITS telt de duren per token op tot frameposities; bf16 kan gehele getallen boven 256
+            # niet exact weergeven, waardoor lange zinnen verkeerd worden uitgelijnd. Duren in fp32.
+            model.duration_predictor.register_forward_hook(lambda module, args, output: output.float())
+        return model
+    raise ValueError(f"Onbekende precisie {precision!r}; kies uit: {', '.join(PRECISIONS)}")
+
+
+def serialized_size(model) -> int:
+    """Grootte van de state_dict in bytes; telt ook de ingepakte INT8-gewichten mee."""
+    import io
+
+    import torch
+
+    buffer = io.BytesIO()
+    torch.save(model.state_dict(), buffer)
+    return buffer.tell()
+
+
+def _align(reference: np.ndarray, test: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    # Een andere precisie kan de voorspelde duur iets veranderen; vergelijk het gemeenschappelijke deel
+    n = min(len(reference), len(test))
+    return reference[:n].astype(np.float64), test[:n].astype(np.float64)
+
+
+def snr_db(reference: np.ndarray, test: np.ndarray) -> float:
+    """Signaal-ruisverhouding van ``test`` ten opzichte van ``reference`` in dB."""
+    reference, test = _align(reference, test)
+    noise = np.sum((reference - test) ** 2)
+    return float("inf") if noise == 0 else float(10 * np.log10(np.sum(reference**2) / noise))
+
+
+def log_spectral_distance(reference: np.ndarray, test: np.ndarray, n_fft: int = 1024, hop: int = 256) -> float:
+    """Gemiddelde log-spectrale afstand in dB tussen de STFT-magnitudes van beide golfvormen."""
+    reference, test = _align(reference, test)
+    if len(reference) < n_fft:
+        n_fft = hop = max(1, len(reference))
+    window = np.hanning(n_fft)
+    starts = np.arange(0, len(reference) - n_fft + 1, hop)
+    frames = starts[:, None] + np.arange(n_fft)
+    power_ref = np.abs(np.fft.rfft(reference[frames] * window, axis=1)) ** 2 + 1e-10
+    power_test = np.abs(np.fft.rfft(test[frames] * window, axis=1)) ** 2 + 1e-10
+    difference = 10 * np.log10(power_ref / power_test)
+    return float(np.mean(np.sqrt(np.mean(difference**2, axis=1))))
@@ -0,0 +1,232 @@
+# Gelijktijdige vergelijkingsrun: één zinnenset door alle backends tegelijk.
+#
+# De scripts in media/ draaien na elkaar, en media/5.py maakt per aanroep een nieuwe OpenAI-client
+# en houdt het hele antwoord in het geheugen voor het wegschrijven. Deze runner verdeelt de
+# zinnen met asyncio over alle backends tegelijk:
+#
+# - offline modellen draaien in een eigen threadpool per backend, zodat een traag model de
+#   andere niet ophoudt;
+# - de cloudreferentie gebruikt één gedeelde httpx.AsyncClient met een verbindingspool en schrijft
+#   de audio in blokken naar schijf terwijl die binnenkomt;
+# - elke backend heeft een eigen maximum aan gelijktijdige verzoeken en een eigen time-out.
+#
+#     python -m tts.runner --out results/comparison                 # alle backends
+#     python -m tts.runner --stub --models OpenAI-TTS-1-hd mms-tts-nld  # cloud via tts.openai_stub
+#
+# Een offline aanroep die zijn time-out overschrijdt wordt meteen als mislukt gemeld, maar een
+# lopende forward-pass is niet te onderbreken: de thread rekent door. Zijn plaats blijft bezet tot
+# hij klaar is, zodat er nooit meer verzoeken tegelijk lopen dan toegestaan, en zijn resultaat
+# wordt weggegooid in plaats van alsnog naar schijf geschreven.
+
+import argparse
+import asyncio
+import contextlib
+import functools
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+
+from .backends import BACKENDS, OpenAIBackend
+from .cache import atomic_write
+from .openai_stub import serve
+from .pool import ModelPool
+from .prompts import PROMPTS
+
+DEFAULT_OUTPUT = Path("results/comparison")
+
+
+@dataclass(frozen=True)
+class Limits:
+    """Maximaal aantal gelijktijdige verzoeken en time-out in seconden voor één backend."""
+
+    concurrency: int = 1
+    timeout: float = 300.0
+
+
+# Offline modellen delen de CPU, dus één verzoek tegelijk per model; de cloud schaalt zelf
+DEFAULT_LIMITS = {OpenAIBackend.name: Limits(concurrency=4, timeout=60.0)}
+
+
+@dataclass
+class Result:
+    model: str
+    index: int
+    path: Path | None
+    seconds: float
+    error: str | None = None
+
+
+class ComparisonRunner:
+    """Genereert een zinnenset met meerdere backends tegelijk en schrijft ``out/<model>/<i>.wav``."""
+
+    def __init__(
+        self,
+        out_dir: str | Path = DEFAULT_OUTPUT,
+        limits: dict | None = None,
+        pool: ModelPool | None = None,
+        base_url: str | None = None,
+        api_key: str | None = None,
+        chunk_size: int = 16 * 1024,
+    ):
+        self.out_dir = Path(out_dir)
+        self.limits = {**DEFAULT_LIMITS, **(limits or {})}
+        self.pool = pool if pool is not None else ModelPool()
+        self.base_url = base_url or os.environ.get("OPENAI_BASE_URL", "https://api.openai.com/v1")
+        self.api_key = api_key or os.environ.get("OPENAI_API_KEY", "")
+        self.chunk_size = chunk_size
+
+    def limit(self, model: str) -> Limits:
+        return self.limits.get(model, Limits())
+
+    def target(self, model: str, index: int) -> Path:
+        return self.out_dir / model / f"{index}.wav"
+
+    async def run(self, texts: list[str], models: list[str] | None = None, voices: dict | None = None) -> list[Result]:
+        """Genereer ``texts`` met alle ``models`` tegelijk; ``voices`` geeft per model de stemopties."""
+        models = list(models or BACKENDS)
+        voices = voices or {}
+        unknown = [model for model in models if model not in BACKENDS]
+        if unknown:
+            raise KeyError(f"Onbekend model {unknown[0]!r}; kies uit: {', '.join(BACKENDS)}")
+
+        for model in models:
+            (self.out_dir / model).mkdir(parents=True, exist_ok=True)
+        cloud = [model for model in models if issubclass(BACKENDS[model], OpenAIBackend)]
+        async with contextlib.AsyncExitStack() as stack:
+            client = await stack.enter_async_context(self._client(cloud)) if cloud else None
+            jobs = []
+            for model in models:
+                if model in cloud:
+                    jobs.append(self._run_cloud(client, model, texts, voices.get(model, {})))
+                else:
+                    executor = stack.enter_context(
+                        ThreadPoolExecutor(self.limit(model).concurrency, thread_name_prefix=model)
+                    )
+                    jobs.append(self._run_offline(executor, model, texts, voices.get(model, {})))
+            results = await asyncio.gather(*jobs)
+        return [result for per_model in results for result in per_model]
+
+    async def _gather(self, model: str, texts: list[str], synthesize) -> list[Result]:
+        limit = self.limit(model)
+        semaphore = asyncio.Semaphore(limit.concurrency)
+
+        async def timed(index, text):
+            # De time-out loopt pas vanaf het moment dat het verzoek aan de beurt is
+            async with semaphore:
+                start = time.perf_counter()
+                task = asyncio.ensure_future(synthesize(index, text))
+                done, _ = await asyncio.wait([task], timeout=limit.timeout)
+                seconds = time.perf_counter() - start
+                if not done:
+                    # Pas de plaats vrijgeven als de taak echt gestopt is; een cloudverzoek stopt
+                    # meteen, een offline thread pas als zijn forward-pass klaar is
+                    task.cancel()
+                    await asyncio.wait([task])
+                    return Result(model, index, None, seconds, "time-out")
+                try:
+                    path = task.result()
+                except Exception as exc:
+                    return Result(model, index, None, seconds, f"{type(exc).__name__}: {exc}")
+                return Result(model, index, path, seconds)
+
+        return await asyncio.gather(*(timed(i, text) for i, text in enumerate(texts)))
+
+    async def _run_offline(self, executor, model: str, texts: list[str], voice: dict) -> list[Result]:
+        import soundfile as sf
+
+        loop = asyncio.get_running_loop()
+        # Eerst laden, zodat de laadtijd niet in de time-out van de eerste zin valt
+        try:
+            backend = await loop.run_in_executor(executor, self.pool.get, model)
+        except Exception as exc:
+            return [Result(model, i, None, 0.0, f"{type(exc).__name__}: {exc}") for i in range(len(texts))]
+
+        async def synthesize(index, text):
+            future = loop.run_in_executor(executor, functools.partial(backend.synthesize, text, **voice))
+            try:
+                speech = await asyncio.shield(future)
+            except asyncio.CancelledError:
+                # Time-out: wachten tot de thread klaar is en het resultaat weggooien
+                await asyncio.wait([future])
+                raise
+            # Vanaf hier geen await meer, dus ook geen annulering: alleen een tijdig resultaat wordt geschreven
+            target = self.target(model, index)
+            with atomic_write(target) as f:
+                sf.write(f, speech.audio, speech.sampling_rate, format="WAV")
+            return target
+
+        return await self._gather(model, texts, synthesize)
+
+    def _client(self, models: list[str]):
+        import httpx
+
+        # Eén verbindingspool voor alle cloudverzoeken; verbindingen worden hergebruikt
+        concurrency = sum(self.limit(model).concurrency for model in models)
+        headers = {"Authorization": f"Bearer {self.api_key}"} if self.api_key else {}
+        return httpx.AsyncClient(
+            base_url=self.base_url,
+            headers=headers,
+            limits=httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency),
+            timeout=httpx.Timeout(None, connect=10.0),
+        )
+
+    async def _run_cloud(self, client, model: str, texts: list[str], voice: dict) -> list[Result]:
+        model_id = BACKENDS[model].model_id
+
+        async def synthesize(index, text):
+            payload = {
+                "model": model_id,
+                "voice": voice.get("voice", "alloy"),
+                "input": text,
+                "response_format": "wav",
+            }
+            async with client.stream("POST", "audio/speech", json=payload) as response:
+                response.raise_for_status()
+                target = self.target(model, index)
+                with atomic_write(target) as f:
+                    async for chunk in response.aiter_bytes(self.chunk_size):
+                        f.write(chunk)
+            return target
+
+        return await self._gather(model, texts, synthesize)
+
+
+def run(
+    texts: list[str],
+    models: list[str] | None = None,
+    out_dir: str | Path = DEFAULT_OUTPUT,
+    voices: dict | None = None,
+    **kwargs,
+) -> list[Result]:
+    """Synchrone ingang voor ``ComparisonRunner.run``; ``kwargs`` gaan naar de constructor."""
+    return asyncio.run(ComparisonRunner(out_dir, **kwargs).run(texts, models, voices))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--models", nargs="+", choices=list(BACKENDS), default=list(BACKENDS))
+    parser.add_argument("--out", type=Path, default=DEFAULT_OUTPUT)
+    parser.add_argument("--stub", action="store_true", help="cloudreferentie via de lokale tts.openai_stub")
+    parser.add_argument("--stub-latency", type=float, default=0.2)
+    args = parser.parse_args(argv)
+
+    with contextlib.ExitStack() as stack:
+        base_url = stack.enter_context(serve(args.stub_latency)) if args.stub else None
+        start = time.perf_counter()
+        results = run(PROMPTS, args.models, args.out, base_url=base_url, api_key="stub" if args.stub else None)
+        elapsed = time.perf_counter() - start
+
+    print(f"{'model':<36} {'ok':>4} {'fouten':>7} {'som s':>7}")
+    for model in args.models:
+        own = [result for result in results if result.model == model]
+        errors = [result for result in own if result.error]
+        print(f"{model:<36} {len(own) - len(errors):>4} {len(errors):>7} {sum(r.seconds for r in own):>7.1f}")
+        for result in errors[:1]:
+            print(f"    {result.error}")
+    print(f"Totaal {elapsed:.1f} s wandtijd, {sum(r.seconds for r in results):.1f} s opgeteld")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+# Kolomgebaseerde opslag van de MOS-scores en modelmetadata voor de resultatenpagina.
+#
+# Eén Parquet-bestand met één rij per model: het model-id, metadata (architectuur, offline of
+# cloud, link, kleur in de grafieken) en de gemiddelde score per criterium. Het bestand wordt één
+# keer ingelezen en geïndexeerd op model-id; sorteren, filteren en pagineren gebeurt daarna op
+# kolommen, zodat de pagina niet per model zwaarder wordt.
+#
+#     python -m tts.scores synthetic --models 1000 --output results/synthetic_scores.parquet
+#
+# Het standaardpad is media/scores.parquet; TTS_SCORES wijst een ander bestand aan, bijvoorbeeld de
+# synthetische tabel hierboven.
+
+import argparse
+import os
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from .mos import CRITERIA
+
+DEFAULT_PATH = Path(os.environ.get("TTS_SCORES", "media/scores.parquet"))
+
+# Metadatakolommen naast de criteria
+METADATA = ["architecture", "offline", "url", "color"]
+
+
+def load_scores(path: str | Path = DEFAULT_PATH) -> pd.DataFrame:
+    """Scoretabel met het model-id als index en een kolom "Gemiddelde" over alle criteria."""
+    table = pd.read_parquet(path).set_index("model", verify_integrity=True)
+    criteria = [c for c in CRITERIA if c in table.columns]
+    table["Gemiddelde"] = table[criteria].mean(axis=1)
+    return table
+
+
+def write_scores(table: pd.DataFrame, path: str | Path) -> None:
+    table = table.drop(columns="Gemiddelde", errors="ignore")
+    table.rename_axis("model").reset_index().to_parquet(path, index=False)
+
+
+def with_ratings(table: pd.DataFrame, means: pd.DataFrame) -> pd.DataFrame:
+    """Vervang de scores van beoordeelde modellen door gemiddelden uit ruwe beoordelingen (zie tts.mos).
+
+    Alleen de beoordeelde cellen veranderen: metadata en de scores van niet-beoordeelde modellen blijven
+    staan. Beoordeelde modellen die nog niet in de tabel staan, komen erbij zonder metadata.
+    """
+    means = means.set_index("Model") if "Model" in means.columns else means
+    table = table.reindex(
+        index=table.index.union(means.index, sort=False).rename(table.index.name),
+        columns=table.columns.union(means.columns, sort=False),
+    )
+    table.update(means)
+    criteria = [c for c in CRITERIA if c in table.columns]
+    table["Gemiddelde"] = table[criteria].mean(axis=1)
+    return table
+
+
+def leaderboard(
+    table: pd.DataFrame,
+    sort_by: str = "Gemiddelde",
+    query: str = "",
+    offline: bool | None = None,
+) -> pd.DataFrame:
+    """Gefilterd op een zoekterm in het model-id en optioneel op offline/cloud, gesorteerd op ``sort_by``."""
+    mask = np.ones(len(table), dtype=bool)
+    if query:
+        mask &= table.index.str.contains(query, case=False, regex=False)
+    if offline is not None and "offline" in table.columns:
+        mask &= (table["offline"] == offline).to_numpy()
+    table = table[mask]
+    if sort_by == "Model":
+        return table.sort_index()
+    # Stabiel sorteren, zodat modellen met gelijke score in een vaste volgorde blijven
+    return table.sort_values(sort_by, ascending=False, kind="stable")
+
+
+def page(table: pd.DataFrame, number: int, size: int = 25) -> pd.DataFrame:
+    """Rijen van pagina ``number`` (vanaf 1)."""
+    start = (number - 1) * size
+    return table.iloc[start:start + size]
+
+
+def page_count(table: pd.DataFrame, size: int = 25) -> int:
+    return max(1, -(-len(table) // size))
+
+
+def synthetic_scores(n: int = 1000, seed: int = 0) -> pd.DataFrame:
+    """Willekeurige maar plausibele scoretabel van ``n`` modellen, om de pagina mee te belasten."""
+    rng = np.random.default_rng(seed)
+    architectures = np.array(["VITS", "SpeechT5", "Parler-TTS", "FastSpeech2", "XTTS"])
+    # Een kwaliteitsniveau per model plus ruis per criterium, afgekapt op de schaal 1-5
+    level = rng.uniform(1.5, 4.8, size=(n, 1))
+    scores = np.clip(level + rng.normal(0, 0.4, size=(n, len(CRITERIA))), 1, 5).round(1)
+    names = [f"synthetic-tts-nl-{i:04d}" for i in range(n)]
+    table = pd.DataFrame(scores, columns=CRITERIA, index=pd.Index(names, name="model"))
+    table.insert(0, "architecture", rng.choice(architectures, size=n))
+    table.insert(1, "offline", rng.random(n) > 0.1)
+    table.insert(2, "url", [f"https://huggingface.co/example/{name}" for name in names])
+    table.insert(3, "color", None)
+    return table
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser()
+    commands = parser.add_subparsers(dest="command", required=True)
+    synthetic = commands.add_parser("synthetic", help="schrijf een synthetische scoretabel")
+    synthetic.add_argument("--models", type=int, default=1000)
+    synthetic.add_argument("--seed", type=int, default=0)
+    synthetic.add_argument("--output", type=Path, default=Path("results/synthetic_scores.parquet"))
+    args = parser.parse_args(argv)
+
+    if args.command == "synthetic":
+        args.output.parent.mkdir(parents=True, exist_ok=True)
+        write_scores(synthetic_scores(args.models, args.seed), args.output)
+        print(f"{args.models} modellen geschreven naar {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,157 @@
+# Memory-mapped opslag van spreker-embeddings (x-vectors) voor de SpeechT5-backend.
+#
+# media/2.py laadt de volledige dataset "Matthijs/cmu-arctic-xvectors" om één embedding te kiezen.
+# Deze module zet de dataset één keer om naar twee .npy-bestanden: een float32-matrix met alle
+# x-vectors en een array met de bijbehorende bestandsnamen. Openen gebeurt met np.load(mmap_mode),
+# dus alleen de header wordt gelezen; een embedding opvragen geeft een view op de gemapte pagina's
+# zonder kopie.
+#
+#     python -m tts.speakers build                # eenmalig, vereist het pakket datasets
+#     python -m tts.speakers nearest slt -k 5     # sprekers die het meest op "slt" lijken
+
+import argparse
+import os
+from pathlib import Path
+
+import numpy as np
+
+from .cache import atomic_write
+
+DEFAULT_DIR = Path(os.environ.get("TTS_SPEAKER_DIR", Path.home() / ".cache" / "tts-nl" / "speakers"))
+DATASET = "Matthijs/cmu-arctic-xvectors"
+
+_VECTORS = "xvectors.npy"
+_NAMES = "names.npy"
+
+
+def build_store(root: str | Path = DEFAULT_DIR, dataset: str = DATASET, split: str = "validation") -> Path:
+    """Zet de x-vector-dataset eenmalig om naar een memory-mapbare store in ``root``."""
+    from datasets import load_dataset
+
+    root = Path(root)
+    root.mkdir(parents=True, exist_ok=True)
+    embeddings_dataset = load_dataset(dataset, split=split)
+    vectors = np.asarray(embeddings_dataset["xvector"], dtype=np.float32)
+    names = np.asarray(embeddings_dataset["filename"], dtype=str)
+
+    # Atomair schrijven, zodat een half geschreven store nooit geopend wordt
+    for filename, array in ((_VECTORS, vectors), (_NAMES, names)):
+        with atomic_write(root / filename) as f:
+            np.save(f, array)
+    return root
+
+
+def speaker_of(name: str) -> str:
+    """Sprekercode uit een CMU Arctic-bestandsnaam, bijv. ``cmu_us_slt_arctic-wav-arctic_a0001`` -> ``slt``."""
+    return name.split("_")[2] if name.startswith("cmu_") else name
+
+
+class SpeakerStore:
+    """Alleen-lezen toegang tot de x-vectors zonder de dataset te laden."""
+
+    def __init__(self, root: str | Path = DEFAULT_DIR):
+        self.root = Path(root)
+        # mmap_mode="c": copy-on-write, zodat torch.from_numpy een schrijfbare view krijgt
+        # terwijl het bestand op schijf nooit verandert
+        self.vectors = np.load(self.root / _VECTORS, mmap_mode="c")
+        self.names = np.load(self.root / _NAMES, mmap_mode="r")
+        self._index = None
+        self._speakers = None
+        self._norms = None
+
+    @classmethod
+    def exists(cls, root: str | Path = DEFAULT_DIR) -> bool:
+        root = Path(root)
+        return (root / _VECTORS).exists() and (root / _NAMES).exists()
+
+    def __len__(self):
+        return len(self.vectors)
+
+    @property
+    def dim(self) -> int:
+        return self.vectors.shape[1]
+
+    def _build_index(self):
+        # Pas bij de eerste opzoeking op naam wordt de index opgebouwd
+        self._index, self._speakers = {}, {}
+        for i, name in enumerate(self.names.tolist()):
+            self._index[name] = i
+            self._speakers.setdefault(speaker_of(name), []).append(i)
+
+    @property
+    def speakers(self) -> list[str]:
+        """Alle sprekercodes in de store."""
+        if self._index is None:
+            self._build_index()
+        return sorted(self._speakers)
+
+    def index(self, speaker: int | str) -> int:
+        """Rij-index van ``speaker``: een index, een bestandsnaam of een sprekercode (eerste opname)."""
+        if isinstance(speaker, (int, np.integer)):
+            if not -len(self) <= speaker < len(self):
+                raise IndexError(f"Spreker {speaker} bestaat niet; de store bevat {len(self)} embeddings")
+            return int(speaker) % len(self)
+        if self._index is None:
+            self._build_index()
+        if speaker in self._index:
+            return self._index[speaker]
+        if speaker in self._speakers:
+            return self._speakers[speaker][0]
+        raise KeyError(f"Onbekende spreker {speaker!r}")
+
+    def get(self, speaker: int | str) -> np.ndarray:
+        """De embedding van ``speaker`` als view op de gemapte matrix (geen kopie)."""
+        return self.vectors[self.index(speaker)]
+
+    def voice(self, speaker: str) -> np.ndarray:
+        """Gemiddelde embedding over alle opnames van een sprekercode, bijv. ``"slt"``."""
+        if self._index is None:
+            self._build_index()
+        if speaker not in self._speakers:
+            raise KeyError(f"Onbekende spreker {speaker!r}")
+        return self.vectors[self._speakers[speaker]].mean(axis=0)
+
+    def nearest(self, query, k: int = 5) -> list[tuple[int, str, float]]:
+        """De ``k`` embeddings met de hoogste cosinusgelijkenis tot ``query``.
+
+        ``query`` is een index, een bestandsnaam, een sprekercode (gemiddelde stem) of een embedding.
+        """
+        if isinstance(query, str) and query in self.speakers:
+            vector = self.voice(query)
+        elif isinstance(query, (str, int, np.integer)):
+            vector = self.get(query)
+        else:
+            vector = np.asarray(query, dtype=np.float32)
+        if self._norms is None:
+            self._norms = np.linalg.norm(self.vectors, axis=1)
+        similarity = self.vectors @ vector / (self._norms * np.linalg.norm(vector) + 1e-12)
+        k = min(k, len(self))
+        top = np.argpartition(-similarity, k - 1)[:k]
+        top = top[np.argsort(-similarity[top])]
+        return [(int(i), str(self.names[i]), float(similarity[i])) for i in top]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--dir", type=Path, default=DEFAULT_DIR)
+    commands = parser.add_subparsers(dest="command", required=True)
+    commands.add_parser("build", help="zet de dataset om naar een memory-mapped store")
+    nearest = commands.add_parser("nearest", help="zoek de meest gelijkende embeddings")
+    nearest.add_argument("query", help="index, bestandsnaam of sprekercode")
+    nearest.add_argument("-k", type=int, default=5)
+    args = parser.parse_args(argv)
+
+    if args.command == "build":
+        root = build_store(args.dir)
+        store = SpeakerStore(root)
+        print(f"{root}: {len(store)} embeddings van {len(store.speakers)} sprekers")
+        return
+
+    store = SpeakerStore(args.dir)
+    query = int(args.query) if args.query.lstrip("-").isdigit() else args.query
+    for i, name, similarity in store.nearest(query, k=args.k):
+        print(f"{i:>6}  {similarity:.3f}  {name}")
+
+
+if __name__ == "__main__":
+    main()
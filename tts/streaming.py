@@ -0,0 +1,38 @@
+# Hulpfuncties voor gestreamde synthese: tekst opknippen op zins- en bijzingrenzen en
+# gegenereerde fragmenten omzetten naar PCM-buffers die direct afgespeeld kunnen worden.
+
+import re
+
+import numpy as np
+
+# Zinseinde: . ! ? of … gevolgd door witruimte
+_SENTENCE_END = re.compile(r"(?<=[.!?…])\s+")
+# Bijzingrens: komma, puntkomma, dubbele punt of gedachtestreepje gevolgd door witruimte
+_CLAUSE_END = re.compile(r"(?<=[,;:–—])\s+")
+
+
+def split_sentences(text: str, max_chars: int = 120) -> list[str]:
+    """Knip ``text`` op in zinnen; zinnen langer dan ``max_chars`` worden op bijzinnen gesplitst."""
+    chunks = []
+    for sentence in _SENTENCE_END.split(text.strip()):
+        if not sentence:
+            continue
+        if len(sentence) <= max_chars:
+            chunks.append(sentence)
+            continue
+        # Lange zin: voeg bijzinnen samen zolang het fragment binnen max_chars blijft
+        current = ""
+        for clause in _CLAUSE_END.split(sentence):
+            if current and len(current) + 1 + len(clause) > max_chars:
+                chunks.append(current)
+                current = clause
+            else:
+                current = f"{current} {clause}" if current else clause
+        if current:
+            chunks.append(current)
+    return chunks
+
+
+def pcm16(audio: np.ndarray) -> bytes:
+    """Zet float-samples in [-1, 1] om naar 16-bit little-endian PCM."""
+    return (np.clip(audio, -1.0, 1.0) * 32767).astype("<i2").tobytes()
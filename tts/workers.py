@@ -0,0 +1,115 @@
+# Multi-process synthese op CPU: een vast aantal workers met elk een vast aantal torch-threads.
+#
+# Eén forward/generate-aanroep schaalt niet lineair met het aantal intra-op threads; meerdere
+# processen met elk een klein threadbudget halen op een CPU-machine meer uitingen per seconde.
+# Met de start-methode "fork" laadt het hoofdproces het model één keer vóór het starten van de
+# workers; die erven de gewichten via copy-on-write en lezen ze alleen, zodat het geheugen niet per
+# worker verdubbelt. Op platformen zonder fork laadt elke worker het model zelf.
+#
+#     with SynthesisWorkers("mms-tts-nld", workers=4, threads_per_worker=1) as pool:
+#         for speech in pool.map(teksten):
+#             ...
+
+import multiprocessing
+from collections import deque
+from collections.abc import Iterable, Iterator
+from concurrent.futures import ProcessPoolExecutor
+
+from .backends import Speech
+
+# In het hoofdproces vooraf geladen backends per model; geforkte workers erven deze. Het aantal open
+# pools per model bepaalt wanneer de backend weer vrijgegeven wordt.
+_preloaded = {}
+_preloaded_users = {}
+# Backend van dit workerproces
+_backend = None
+
+
+def _init_worker(model: str, revision: str, threads: int) -> None:
+    global _backend
+    import torch
+
+    torch.set_num_threads(threads)
+    try:
+        torch.set_num_interop_threads(1)
+    except RuntimeError:
+        pass  # Kan maar één keer per proces gezet worden
+    _backend = _preloaded.get((model, revision))
+    if _backend is None:
+        from .pool import ModelPool
+
+        _backend = ModelPool(revisions={model: revision}).get(model)
+
+
+def _ready() -> bool:
+    return True
+
+
+def _synthesize(text: str, voice: dict) -> Speech:
+    return _backend.synthesize(text, **voice)
+
+
+class SynthesisWorkers:
+    """Procespool die teksten over ``workers`` processen verdeelt en de resultaten in volgorde teruggeeft."""
+
+    def __init__(
+        self,
+        model: str,
+        workers: int = 2,
+        threads_per_worker: int = 1,
+        max_pending: int | None = None,
+        revision: str = "main",
+    ):
+        self.model = model
+        self.workers = workers
+        self.threads_per_worker = threads_per_worker
+        # Back-pressure: nooit meer dan max_pending taken tegelijk in de wachtrij
+        self.max_pending = max_pending or 2 * workers
+
+        if "fork" in multiprocessing.get_all_start_methods():
+            context = multiprocessing.get_context("fork")
+            # Laden vóór het forken, maar niets uitvoeren: een al gestarte OpenMP-threadpool
+            # overleeft een fork niet goed
+            from .pool import ModelPool
+
+            if (model, revision) not in _preloaded:
+                _preloaded[model, revision] = ModelPool(revisions={model: revision}).get(model)
+            _preloaded_users[model, revision] = _preloaded_users.get((model, revision), 0) + 1
+            self._preloaded_key = (model, revision)
+        else:
+            context = multiprocessing.get_context("spawn")
+            self._preloaded_key = None
+        self._executor = ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=context,
+            initializer=_init_worker,
+            initargs=(model, revision, threads_per_worker),
+        )
+        # Start alle workers meteen, zodat het laden niet in de eerste meting of aanvraag valt
+        self._executor.submit(_ready).result()
+
+    def map(self, texts: Iterable[str], **voice) -> Iterator[Speech]:
+        """Genereer alle ``texts``; resultaten komen in dezelfde volgorde terug als de invoer."""
+        pending = deque()
+        for text in texts:
+            if len(pending) >= self.max_pending:
+                yield pending.popleft().result()
+            pending.append(self._executor.submit(_synthesize, text, voice))
+        while pending:
+            yield pending.popleft().result()
+
+    def close(self) -> None:
+        self._executor.shutdown(cancel_futures=True)
+        # De laatste pool van dit model geeft de vooraf geladen backend in het hoofdproces weer vrij
+        key, self._preloaded_key = self._preloaded_key, None
+        if key is not None:
+            _preloaded_users[key] -= 1
+            if not _preloaded_users[key]:
+                del _preloaded_users[key]
+                _preloaded.pop(key).unload()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()